@@ -1,5 +1,7 @@
 from django.contrib import admin, messages
-from django.db.models import Count
+from django.contrib.admin.views.main import ChangeList
+from django.db.models import Case, Count, Exists, IntegerField, OuterRef, Subquery, Value, When
+from django.db.models.functions import Coalesce, Trim, Upper
 from django.utils.html import format_html
 from django.utils import timezone
 from django.utils.safestring import mark_safe
@@ -13,13 +15,127 @@ except Exception:
     PostSlugHistory = None
 
 import re
+from functools import lru_cache
 
+# 루프/행 단위로 쓰이는 패턴은 모듈 로드 시 1회 컴파일 (re._cache 조회 생략)
+_ALIAS_NORM_SPLIT_RE = re.compile(r"[,;|\n]+")
+_ALIAS_SPLIT_RE = re.compile(r"[,;|]")
+_PAREN_EN_RE = re.compile(r"\(([^)]+)\)")
 
+
+# 행마다 재생성하던 HTML 조각 — 템플릿은 상수로, 정적 스니펫은 mark_safe로 1회만
+_OK_SPAN = mark_safe('<span style="color:#2e7d32;">OK</span>')
+_WARN_SPAN_TPL = '<span title="{}" style="color:#d32f2f;font-weight:700;">⚠ {}</span>'
+_OPEN_LINK_TPL = '<a href="{}" target="_blank" rel="noopener">열기</a>'
+_IMG_FLAG_TPL = '<img src="{}" style="height:22px;border-radius:4px;border:1px solid #ddd;" />'
+_IMG_INLINE_TPL = '<img src="{}" style="height:60px;border-radius:6px;" />'
+_IMG_THUMB_TPL = '<img src="{}" style="height:28px;border-radius:6px;" />'
+
+
+@lru_cache(maxsize=1024)
+def _file_url(storage, name: str) -> str:
+    """
+    FieldFile.url은 호출마다 Storage 백엔드를 거친다(원격 스토리지는 URL 조합/서명 비용).
+    changelist 한 페이지에 같은 파일이 행마다 다시 조회되므로 (storage, name) 단위로 캐시.
+    """
+    return storage.url(name)
+
+
+def _subquery_count(related_model, fk_name: str):
+    """
+    changelist 카운트용 스칼라 상관 서브쿼리.
+
+    Count("related", distinct=True) annotate는 JOIN + GROUP BY를 강제해
+    행/연관행 수에 비례해 느려지고, paginator의 COUNT(*)까지 GROUP BY로 감싼다.
+    서브쿼리는 행당 인덱스 스캔 1회로 끝나고 admin_order_field 정렬도 그대로 가능.
+    """
+    return Coalesce(
+        Subquery(
+            related_model.objects
+            .filter(**{fk_name: OuterRef("pk")})
+            .order_by()
+            .values(fk_name)
+            .annotate(c=Count("*"))
+            .values("c"),
+            output_field=IntegerField(),
+        ),
+        0,
+    )
+
+
+class DisplayAnnotationsChangeList(ChangeList):
+    """
+    display 전용 annotation/prefetch를 paginator COUNT(*) 경로에서 분리.
+
+    ModelAdmin에 get_queryset_annotations(request, qs)가 정의돼 있으면
+    전체 필터 쿼리셋이 아니라 현재 페이지 행(result_list)에만 적용한다.
+    → COUNT(*)가 annotation/GROUP BY를 끌고 가지 않고, prefetch도 페이지 단위로만 실행.
+    """
+
+    def get_results(self, request):
+        super().get_results(request)
+
+        get_annotations = getattr(self.model_admin, "get_queryset_annotations", None)
+        if get_annotations is None:
+            return
+
+        pks = [obj.pk for obj in self.result_list]
+        if not pks:
+            return
+
+        # list_editable formset이 queryset을 요구하므로 list로 바꾸지 않고
+        # 페이지 pk만으로 다시 쿼리셋을 만든다 (정렬은 page 쿼리 순서 보존).
+        # root_queryset에는 apply_select_related가 아직 안 탔으므로 여기서 다시 적용
+        # (안 하면 list_select_related가 무시돼 FK 컬럼 렌더가 행당 SELECT로 돌아감)
+        order = Case(*(When(pk=pk, then=i) for i, pk in enumerate(pks)), output_field=IntegerField())
+        page_qs = self.apply_select_related(self.root_queryset.filter(pk__in=pks))
+        self.result_list = get_annotations(request, page_qs).order_by(order)
+
+
+def _changelist_ordered_by(request, model_admin, field_name: str) -> bool:
+    """changelist 정렬 파라미터("o"=list_display 인덱스 목록)가 field_name 정렬인지 확인."""
+    o = (request.GET.get("o") or "").strip()
+    if not o:
+        return False
+    # ChangeList와 동일한 컬럼 인덱스 기준 (actions 있으면 action_checkbox가 0번)
+    list_display = list(model_admin.get_list_display(request))
+    if model_admin.get_actions(request):
+        list_display = ["action_checkbox", *list_display]
+    for part in o.split("."):
+        idx = part.lstrip("-")
+        if not idx.isdigit():
+            continue
+        try:
+            attr = list_display[int(idx)]
+        except IndexError:
+            continue
+        func = getattr(model_admin, str(attr), None)
+        if attr == field_name or getattr(func, "admin_order_field", None) == field_name:
+            return True
+    return False
+
+
+def _aliases_obviously_dirty(raw: str) -> bool:
+    """
+    정규화가 확실히 필요한 경우만 빠르게 판별 (바이트 스캔, 할당 없음).
+    False라고 '정규화 완료'는 아님(중복 토큰 등) — 그 경우 전체 파이프라인으로 확인.
+    """
+    return (
+        ";" in raw
+        or "|" in raw
+        or "\n" in raw
+        or ",," in raw
+        or ", ," in raw
+        or raw != raw.strip()
+    )
+
+
+@lru_cache(maxsize=4096)
 def _normalize_aliases(raw: str) -> str:
-    """aliases를 'comma+space' 포맷으로 정규화."""
+    """aliases를 'comma+space' 포맷으로 정규화. (순수 함수 — changelist 행마다 불려 캐시)"""
     if not raw:
         return ""
-    parts = re.split(r"[,;|\n]+", raw)
+    parts = _ALIAS_NORM_SPLIT_RE.split(raw)
     items = [p.strip() for p in parts if p.strip()]
     seen = set()
     out = []
@@ -108,9 +224,21 @@ class CountryAdmin(admin.ModelAdmin):
 
     actions = ("action_normalize_country_fields", "action_autofill_aliases")
 
+    def get_changelist(self, request, **kwargs):
+        return DisplayAnnotationsChangeList
+
     def get_queryset(self, request):
         qs = super().get_queryset(request)
-        return qs.annotate(posts_total=Count("posts", distinct=True))
+        # posts_total 정렬 요청일 때만 annotation을 메인 쿼리셋에 포함.
+        # 필터/검색만 하는 일반적인 뷰에서는 COUNT(*)와 페이지 SELECT 모두
+        # 서브쿼리 없이 돌고, 표시용 값은 get_queryset_annotations가 페이지 행에만 붙인다.
+        if _changelist_ordered_by(request, self, "posts_total"):
+            qs = self.get_queryset_annotations(request, qs)
+        return qs
+
+    def get_queryset_annotations(self, request, qs):
+        """changelist 표시 전용 annotation — COUNT(*) 경로에서는 타지 않음."""
+        return qs.annotate(posts_total=_subquery_count(Post, "country_id"))
 
     def posts_count(self, obj: Country):
         return getattr(obj, "posts_total", 0)
@@ -124,35 +252,26 @@ class CountryAdmin(admin.ModelAdmin):
         if obj.iso_a3 and len(obj.iso_a3) != 3:
             issues.append("iso_a3")
 
-        raw = (getattr(obj, "aliases", "") or "").strip()
-        if raw and _normalize_aliases(raw) != raw:
+        raw = (obj.aliases or "").strip()
+        # 싼 스캔으로 명백히 더러운 경우 먼저 거르고, 애매하면 (캐시된) 전체 정규화로 비교
+        if raw and (_aliases_obviously_dirty(raw) or _normalize_aliases(raw) != raw):
             issues.append("aliases")
 
         if not issues:
-            return mark_safe('<span style="color:#2e7d32;">OK</span>')
+            return _OK_SPAN
 
-        return format_html(
-            '<span title="{}" style="color:#d32f2f;font-weight:700;">⚠ {}</span>',
-            ", ".join(issues),
-            len(issues),
-        )
+        return format_html(_WARN_SPAN_TPL, ", ".join(issues), len(issues))
     data_warnings.short_description = "Check"
 
     def view_on_site_link(self, obj: Country):
-        return format_html(
-            '<a href="{}" target="_blank" rel="noopener">열기</a>',
-            obj.get_absolute_url()
-        )
+        return format_html(_OPEN_LINK_TPL, obj.get_absolute_url())
     view_on_site_link.short_description = "Site"
 
     def flag_preview(self, obj: Country):
         if not getattr(obj, "flag_image", None):
             return "-"
         try:
-            return format_html(
-                '<img src="{}" style="height:22px;border-radius:4px;border:1px solid #ddd;" />',
-                obj.flag_image.url
-            )
+            return format_html(_IMG_FLAG_TPL, _file_url(obj.flag_image.storage, obj.flag_image.name))
         except Exception:
             return "-"
     flag_preview.short_description = "Flag"
@@ -162,11 +281,18 @@ class CountryAdmin(admin.ModelAdmin):
         before_iso_a2 = None
         before_iso_a3 = None
         if change and obj.pk:
-            old = Country.objects.filter(pk=obj.pk).values("aliases", "iso_a2", "iso_a3").first()
-            if old:
-                before_aliases = (old.get("aliases") or "").strip()
-                before_iso_a2 = old.get("iso_a2")
-                before_iso_a3 = old.get("iso_a3")
+            # ModelForm이 이미 변경 전 값을 들고 있다 — 저장 직전 SELECT 불필요
+            initial = form.initial
+            if {"aliases", "iso_a2", "iso_a3"} <= initial.keys():
+                before_aliases = (initial.get("aliases") or "").strip()
+                before_iso_a2 = initial.get("iso_a2")
+                before_iso_a3 = initial.get("iso_a3")
+            else:
+                old = Country.objects.filter(pk=obj.pk).values("aliases", "iso_a2", "iso_a3").first()
+                if old:
+                    before_aliases = (old.get("aliases") or "").strip()
+                    before_iso_a2 = old.get("iso_a2")
+                    before_iso_a3 = old.get("iso_a3")
 
         super().save_model(request, obj, form, change)
 
@@ -180,73 +306,65 @@ class CountryAdmin(admin.ModelAdmin):
 
     @admin.action(description="선택 국가: ISO/slug/name 공백 정규화")
     def action_normalize_country_fields(self, request, queryset):
-        updated = 0
-        for c in queryset:
-            changed = False
-
-            if getattr(c, "iso_a2", None):
-                v = (c.iso_a2 or "").strip().upper()
-                if c.iso_a2 != v:
-                    c.iso_a2 = v
-                    changed = True
-
-            if getattr(c, "iso_a3", None):
-                v = (c.iso_a3 or "").strip().upper()
-                if c.iso_a3 != v:
-                    c.iso_a3 = v
-                    changed = True
-
-            for fld in ("name", "name_ko", "name_en"):
-                if hasattr(c, fld):
-                    v = (getattr(c, fld) or "").strip()
-                    if getattr(c, fld) != v:
-                        setattr(c, fld, v)
-                        changed = True
-
-            if getattr(c, "slug", None):
-                v = (c.slug or "").strip()
-                if c.slug != v:
-                    c.slug = v
-                    changed = True
-
-            if changed:
-                c.save()
-                updated += 1
-
+        # per-row save() 루프 대신 DB-side UPPER/TRIM 단일 UPDATE (N → 1 round-trip)
+        updated = queryset.update(
+            iso_a2=Upper(Trim("iso_a2")),
+            iso_a3=Upper(Trim("iso_a3")),
+            name=Trim("name"),
+            name_ko=Trim("name_ko"),
+            name_en=Trim("name_en"),
+            slug=Trim("slug"),
+        )
         self.message_user(request, f"{updated}개 국가를 정규화했습니다.")
 
     @admin.action(description="선택 국가: aliases 자동 보강(name/name_en/괄호영문)")
     def action_autofill_aliases(self, request, queryset):
-        updated = 0
-
         def extract_paren_en(display_name: str) -> str:
-            m = re.search(r"\(([^)]+)\)", display_name or "")
+            m = _PAREN_EN_RE.search(display_name or "")
             return (m.group(1).strip() if m else "")
 
         def split_aliases(s: str) -> list[str]:
             if not s:
                 return []
-            parts = re.split(r"[,;|]", s)
+            parts = _ALIAS_SPLIT_RE.split(s)
             return [p.strip() for p in parts if p.strip()]
 
-        for c in queryset:
-            before = (getattr(c, "aliases", "") or "").strip()
-            items = set(split_aliases(before))
-
-            nm = (getattr(c, "name", "") or "").strip()
-            nm_en = (getattr(c, "name_en", "") or "").strip()
+        updated = 0
+        to_update = []
+
+        def flush():
+            nonlocal updated
+            if to_update:
+                Country.objects.bulk_update(to_update, ["aliases"], batch_size=500)
+                updated += len(to_update)
+                to_update.clear()
+
+        # 전체 선택(수만 행)에도 메모리가 평평하도록 서버 커서 단위로 순회
+        for c in queryset.iterator(chunk_size=500):
+            # 모델이 보장하는 필드 — getattr(기본값) 우회 없이 직접 접근
+            before = (c.aliases or "").strip()
+
+            nm = (c.name or "").strip()
+            nm_en = (c.name_en or "").strip()
             paren = extract_paren_en(nm)
 
+            # 기존 순서 보존 + 진짜 새 alias만 뒤에 추가.
+            # (sorted()로 재배열하면 내용 변화 없이도 after != before가 되어 불필요한 UPDATE 발생)
+            items = list(dict.fromkeys(split_aliases(before)))
+            seen = set(items)
             for v in (nm, nm_en, paren):
-                v = (v or "").strip()
-                if v and v not in items:
-                    items.add(v)
+                if v and v not in seen:
+                    items.append(v)
+                    seen.add(v)
 
-            after = ", ".join(sorted(items))
+            after = ", ".join(items)
             if after != before:
                 c.aliases = after
-                c.save(update_fields=["aliases"])
-                updated += 1
+                to_update.append(c)
+                if len(to_update) >= 500:
+                    flush()
+
+        flush()
 
         self.message_user(request, f"{updated}개 국가의 aliases를 보강했습니다.")
 
@@ -281,10 +399,7 @@ class PostImageInline(admin.TabularInline):
         if not obj or not getattr(obj, "image", None):
             return "-"
         try:
-            return format_html(
-                '<img src="{}" style="height:60px;border-radius:6px;" />',
-                obj.image.url
-            )
+            return format_html(_IMG_INLINE_TPL, _file_url(obj.image.storage, obj.image.name))
         except Exception:
             return "-"
     preview.short_description = "미리보기"
@@ -310,10 +425,15 @@ class PostAdmin(admin.ModelAdmin):
         "view_on_site_link",
     )
     list_filter = ("country", "category", "is_published", "tags")
-    search_fields = ("title", "slug", "content", "tags__name", "tags__slug")
+    # content(대용량 TEXT) LIKE 풀스캔 방지 — 본문 검색이 필요해지면
+    # SearchVectorField + GinIndex로 별도 도입
+    search_fields = ("title", "slug", "tags__name", "tags__slug")
     ordering = ("-published_at", "-created_at", "-id")
     list_per_page = 50
 
+    # country 컬럼/URL 렌더마다 행당 SELECT 나가는 것 방지
+    list_select_related = ("country",)
+
     autocomplete_fields = ("country",)
     filter_horizontal = ("tags",)
 
@@ -335,26 +455,39 @@ class PostAdmin(admin.ModelAdmin):
         issues = []
         if obj.is_published and not obj.published_at:
             issues.append("published_at")
-        if PostSlugHistory is not None:
-            try:
-                if obj.pk and PostSlugHistory.objects.filter(post=obj).exists():
-                    issues.append("slug_history")
-            except Exception:
-                pass
+        # 행당 EXISTS 쿼리(N+1) 대신 get_queryset_annotations의 Exists annotation 사용
+        if getattr(obj, "has_slug_history", False):
+            issues.append("slug_history")
 
         if not issues:
-            return mark_safe('<span style="color:#2e7d32;">OK</span>')
+            return _OK_SPAN
 
-        return format_html(
-            '<span title="{}" style="color:#d32f2f;font-weight:700;">⚠ {}</span>',
-            ", ".join(issues),
-            len(issues),
-        )
+        return format_html(_WARN_SPAN_TPL, ", ".join(issues), len(issues))
     data_warnings.short_description = "Check"
 
+    def get_changelist(self, request, **kwargs):
+        return DisplayAnnotationsChangeList
+
     def get_queryset(self, request):
-        qs = super().get_queryset(request)
-        return qs.annotate(images_total=Count("images", distinct=True)).prefetch_related("images", "tags")
+        # changelist는 content(마크다운 본문)를 그리지 않는다 — 행당 KB 단위 전송 절약.
+        # 접근 시(예: change form의 rendered_preview) Django가 자동 재조회한다.
+        qs = super().get_queryset(request).defer("content")
+        # images_total 정렬 요청일 때만 annotation을 메인 쿼리셋에 포함
+        # (그 외에는 get_queryset_annotations가 페이지 행에만 적용)
+        if _changelist_ordered_by(request, self, "images_total"):
+            qs = self.get_queryset_annotations(request, qs)
+        return qs
+
+    def get_queryset_annotations(self, request, qs):
+        """changelist 표시 전용 annotation/prefetch — COUNT(*) 경로에서는 타지 않음."""
+        # images/tags prefetch 금지: 리스트는 images_total(집계)과 cover_preview(직접 필드)만
+        # 그린다. tags는 list_filter용일 뿐이고 필터는 자체 쿼리를 쓴다.
+        qs = qs.annotate(images_total=_subquery_count(PostImage, "post_id"))
+        if PostSlugHistory is not None:
+            qs = qs.annotate(
+                has_slug_history=Exists(PostSlugHistory.objects.filter(post=OuterRef("pk")))
+            )
+        return qs
 
     def images_count(self, obj: Post):
         return getattr(obj, "images_total", 0)
@@ -365,24 +498,19 @@ class PostAdmin(admin.ModelAdmin):
         if not getattr(obj, "cover_image", None):
             return "-"
         try:
-            return format_html(
-                '<img src="{}" style="height:28px;border-radius:6px;" />',
-                obj.cover_image.url
-            )
+            return format_html(_IMG_THUMB_TPL, _file_url(obj.cover_image.storage, obj.cover_image.name))
         except Exception:
             return "-"
     cover_preview.short_description = "Cover"
 
     def view_on_site_link(self, obj: Post):
-        return format_html(
-            '<a href="{}" target="_blank" rel="noopener">열기</a>',
-            obj.get_absolute_url()
-        )
+        return format_html(_OPEN_LINK_TPL, obj.get_absolute_url())
     view_on_site_link.short_description = "Site"
 
     def rendered_preview(self, obj: Post):
         if not obj or not obj.pk:
             return "저장 후 미리보기가 표시됩니다."
+        # rendered_content가 모델 레벨에서 같은 updated_at 버전 키로 캐시하므로 여기선 그냥 호출
         html2 = obj.rendered_content()
         return format_html(
             '<div style="max-height:280px;overflow:auto;border:1px solid #ddd;padding:10px;border-radius:8px;">{}</div>',
@@ -390,16 +518,43 @@ class PostAdmin(admin.ModelAdmin):
         )
     rendered_preview.short_description = "본문 미리보기"
 
+    def save_formset(self, request, form, formset, change):
+        # 이미지 N장 업로드 시 save()마다 MAX(order) SELECT + INSERT가 나가는 것 방지:
+        # order 미지정 신규 행은 bulk_append로 모아 SELECT 1번 + INSERT 배치 1번에 처리
+        if formset.model is not PostImage:
+            return super().save_formset(request, form, formset, change)
+
+        instances = formset.save(commit=False)
+        for obj in formset.deleted_objects:
+            obj.delete()
+
+        appended = []
+        for obj in instances:
+            if obj.pk is None and (obj.order is None or obj.order == 0):
+                appended.append(obj)
+            else:
+                obj.save()
+        if appended:
+            PostImage.bulk_append(form.instance, appended)
+        formset.save_m2m()
+
     def save_model(self, request, obj, form, change):
         old_slug = None
         old_country_id = None
         old_category = None
         if change and obj.pk:
-            old = Post.objects.filter(pk=obj.pk).values("slug", "country_id", "category").first()
-            if old:
-                old_slug = old.get("slug")
-                old_country_id = old.get("country_id")
-                old_category = old.get("category")
+            # ModelForm이 이미 변경 전 값을 들고 있다 — 저장 직전 SELECT 불필요
+            initial = form.initial
+            if {"slug", "country", "category"} <= initial.keys():
+                old_slug = initial.get("slug")
+                old_country_id = initial.get("country")
+                old_category = initial.get("category")
+            else:
+                old = Post.objects.filter(pk=obj.pk).values("slug", "country_id", "category").first()
+                if old:
+                    old_slug = old.get("slug")
+                    old_country_id = old.get("country_id")
+                    old_category = old.get("category")
 
         super().save_model(request, obj, form, change)
 
@@ -414,39 +569,53 @@ class PostAdmin(admin.ModelAdmin):
 
     @admin.action(description="선택 글 발행(오늘 날짜 자동 설정)")
     def action_publish(self, request, queryset):
-        today = timezone.localdate()
-        updated = 0
-        for p in queryset:
-            if not p.is_published:
-                p.is_published = True
-            if not p.published_at:
-                p.published_at = today
-            p.save(update_fields=["is_published", "published_at", "updated_at"])
-            updated += 1
+        # per-row save() 대신 단일 UPDATE (published_at은 비어 있을 때만 오늘로)
+        # .update()는 auto_now를 타지 않으므로 updated_at을 직접 갱신
+        updated = queryset.update(
+            is_published=True,
+            published_at=Coalesce("published_at", Value(timezone.localdate())),
+            updated_at=timezone.now(),
+        )
         self.message_user(request, f"{updated}개 글을 발행했습니다.")
 
     @admin.action(description="선택 글 비공개")
     def action_unpublish(self, request, queryset):
-        updated = queryset.update(is_published=False)
+        # admin queryset이 달고 오는 ORDER BY/select_related JOIN을 UPDATE에서 떼어내고
+        # PK 집합으로만 갱신 (플래너가 PK 인덱스를 바로 타게)
+        updated = Post.objects.filter(pk__in=queryset.order_by().values("pk")).update(
+            is_published=False,
+            updated_at=timezone.now(),
+        )
         self.message_user(request, f"{updated}개 글을 비공개로 변경했습니다.")
 
     def save_related(self, request, form, formsets, change):
         super().save_related(request, form, formsets, change)
 
         obj: Post = form.instance
-        imgs = list(obj.images.order_by("order", "id"))
-        changed2 = False
-        current = 10
-        for im in imgs:
-            if im.order != current:
-                im.order = current
-                current += 10
-                changed2 = True
-            else:
-                current += 10
-
-        if changed2:
-            PostImage.objects.bulk_update(imgs, ["order"])
+        # inline formset이 방금 저장한 인스턴스를 이미 들고 있다 — 재조회 대신 재사용
+        # (삭제된 폼의 instance는 delete()가 pk를 None으로 만들어 걸러진다)
+        imgs = None
+        for fs in formsets:
+            if getattr(fs, "model", None) is PostImage:
+                imgs = sorted(
+                    (f.instance for f in fs.forms if f.instance.pk is not None),
+                    key=lambda im: (im.order or 0, im.pk),
+                )
+                break
+
+        if imgs is None:
+            # formset이 없는 경로(프로그램적 저장 등)만 DB에서 (id, order) 재조회
+            imgs = obj.images.order_by("order", "id").only("id", "order")
+        mismatched = []
+        for idx, im in enumerate(imgs):
+            want = (idx + 1) * 10
+            if im.order != want:
+                im.order = want
+                mismatched.append(im)
+
+        # 이미 10,20,30…이면 UPDATE 자체를 생략
+        if mismatched:
+            PostImage.objects.bulk_update(mismatched, ["order"], batch_size=200)
 
     class Media:
         css = {"all": ("blog/css/admin_extra.css",)}
@@ -465,14 +634,14 @@ class PostImageAdmin(admin.ModelAdmin):
     ordering = ("-created_at", "-id")
     autocomplete_fields = ("post",)
 
+    # post 컬럼 렌더마다 행당 SELECT 나가는 것 방지 (1 + N → 1)
+    list_select_related = ("post",)
+
     def thumb(self, obj: PostImage):
         if not getattr(obj, "image", None):
             return "-"
         try:
-            return format_html(
-                '<img src="{}" style="height:28px;border-radius:6px;" />',
-                obj.image.url
-            )
+            return format_html(_IMG_THUMB_TPL, _file_url(obj.image.storage, obj.image.name))
         except Exception:
             return "-"
     thumb.short_description = "Preview"
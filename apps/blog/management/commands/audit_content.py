@@ -1,22 +1,30 @@
 from __future__ import annotations
 
-import re
-from typing import Iterable
+from functools import lru_cache
 
 from django.core.management.base import BaseCommand
-from django.db.models import Count, Q
+from django.db.models import Count, Exists, OuterRef, Q
 from django.db.models.functions import Lower
 from django.utils.text import slugify
 
 from apps.blog.models import Country, Post, PostSlugHistory, Tag
 
 
-ISO_A2_RE = re.compile(r"^[A-Z]{2}$")
-ISO_A3_RE = re.compile(r"^[A-Z]{3}$")
+# DB-side(__regex) 검사용 ISO 포맷
+ISO_A2_REGEX = r"^[A-Z]{2}$"
+ISO_A3_REGEX = r"^[A-Z]{3}$"
 
+# "값이 있는데 포맷이 틀린" 조건 (aggregate filter로 재사용)
+BAD_ISO_A2_Q = Q(iso_a2__isnull=False) & ~Q(iso_a2="") & ~Q(iso_a2__regex=ISO_A2_REGEX)
+BAD_ISO_A3_Q = Q(iso_a3__isnull=False) & ~Q(iso_a3="") & ~Q(iso_a3__regex=ISO_A3_REGEX)
 
+
+@lru_cache(maxsize=8192)
 def _smart_slugify(base: str) -> str:
-    """Slugify helper mirroring our model behavior (fallback allow_unicode)."""
+    """Slugify helper mirroring our model behavior (fallback allow_unicode).
+
+    slugify는 유니코드 정규화를 수반하므로 반복 입력(중복 태그명 등)은 memoize.
+    """
     base = (base or "").strip()
     s = slugify(base)
     if not s:
@@ -24,11 +32,6 @@ def _smart_slugify(base: str) -> str:
     return s or ""
 
 
-def _print_lines(lines: Iterable[str]) -> None:
-    for line in lines:
-        print(line)
-
-
 class Command(BaseCommand):
     help = "Read-only audit for content data integrity (Country/Tag/Post). Does NOT modify DB."
 
@@ -50,16 +53,36 @@ class Command(BaseCommand):
         sample: int = int(options.get("sample") or 50)
 
         issues: list[str] = []
-        info: list[str] = []
 
-        info.append("=== DongriGo Content Audit (read-only) ===")
+        # 전체 출력을 리스트로 끝까지 들고 있지 않고, 작은 버퍼 단위로 self.stdout에 흘려보낸다
+        # (self.stdout은 Django의 OutputWrapper — 테스트/CI의 stdout 캡처를 그대로 따라간다)
+        buf: list[str] = []
+
+        def flush() -> None:
+            if buf:
+                self.stdout.write("\n".join(buf))
+                buf.clear()
+
+        def out(line: str) -> None:
+            buf.append(line)
+            if len(buf) >= 100:
+                flush()
+
+        out("=== DongriGo Content Audit (read-only) ===")
 
         # -------------------------
         # Country checks
         # -------------------------
-        info.append("\n[Country]")
-        country_count = Country.objects.count()
-        info.append(f"- total: {country_count}")
+        out("\n[Country]")
+        # 스칼라 카운트는 모델당 1회 aggregate로 묶는다 (체크마다 풀스캔 금지)
+        country_agg = Country.objects.aggregate(
+            total=Count("id"),
+            non_lower_slug=Count("id", filter=~Q(slug=Lower("slug"))),
+            missing_slug=Count("id", filter=Q(slug__isnull=True) | Q(slug="")),
+            bad_a2=Count("id", filter=BAD_ISO_A2_Q),
+            bad_a3=Count("id", filter=BAD_ISO_A3_Q),
+        )
+        out(f"- total: {country_agg['total']}")
 
         # slug duplicates
         dup_country_slugs = (
@@ -68,59 +91,52 @@ class Command(BaseCommand):
             .filter(c__gt=1)
             .order_by("-c")
         )
-        if dup_country_slugs.exists():
-            issues.append(f"Country.slug duplicate groups: {dup_country_slugs.count()}")
+        # 빈 테이블이면 GROUP BY 쿼리 생략 (exists()+count()+iterate 3중 실행 방지도 겸함)
+        dup_country_rows = list(dup_country_slugs) if country_agg["total"] else []
+        if dup_country_rows:
+            issues.append(f"Country.slug duplicate groups: {len(dup_country_rows)}")
             if verbose:
-                for row in dup_country_slugs:
-                    info.append(f"  ! dup slug='{row['slug']}' count={row['c']}")
+                for row in dup_country_rows:
+                    out(f"  ! dup slug='{row['slug']}' count={row['c']}")
         else:
-            info.append("- slug duplicates: OK")
+            out("- slug duplicates: OK")
 
         # slug casing
-        non_lower_country_slugs = Country.objects.exclude(slug=Lower("slug")).count()
+        non_lower_country_slugs = country_agg["non_lower_slug"]
         if non_lower_country_slugs:
             issues.append(f"Country.slug not lowercase: {non_lower_country_slugs}")
             if verbose:
-                for c in Country.objects.exclude(slug=Lower("slug")).only("id", "slug")[:sample]:
-                    info.append(f"  ! {c.id} slug='{c.slug}'")
+                for c in Country.objects.exclude(slug=Lower("slug")).values("id", "slug")[:sample]:
+                    out(f"  ! {c['id']} slug='{c['slug']}'")
         else:
-            info.append("- slug lowercase: OK")
+            out("- slug lowercase: OK")
 
         # missing slug
-        missing_country_slug = Country.objects.filter(Q(slug__isnull=True) | Q(slug="")).count()
+        missing_country_slug = country_agg["missing_slug"]
         if missing_country_slug:
             issues.append(f"Country.slug missing: {missing_country_slug}")
             if verbose:
-                info.append(f"  ! missing slug rows: {missing_country_slug}")
+                out(f"  ! missing slug rows: {missing_country_slug}")
         else:
-            info.append("- slug missing: OK")
+            out("- slug missing: OK")
 
         # ISO format (optional fields) - should be uppercase 2/3 letters
-        bad_iso_a2_ids: list[tuple[int, str, str]] = []
-        bad_iso_a3_ids: list[tuple[int, str, str]] = []
-        for c in Country.objects.all().only("id", "slug", "iso_a2", "iso_a3").iterator():
-            a2 = (c.iso_a2 or "").strip()
-            a3 = (c.iso_a3 or "").strip()
-            if a2 and not ISO_A2_RE.match(a2):
-                bad_iso_a2_ids.append((c.id, c.slug, a2))
-            if a3 and not ISO_A3_RE.match(a3):
-                bad_iso_a3_ids.append((c.id, c.slug, a3))
-
-        if bad_iso_a2_ids:
-            issues.append(f"Country.iso_a2 invalid: {len(bad_iso_a2_ids)}")
+        # Python 루프 대신 DB-side __regex 카운트 (샘플은 문제 있을 때만 재조회)
+        if country_agg["bad_a2"]:
+            issues.append(f"Country.iso_a2 invalid: {country_agg['bad_a2']}")
             if verbose:
-                for cid, slug, a2 in bad_iso_a2_ids[:sample]:
-                    info.append(f"  ! {cid} slug={slug} iso_a2='{a2}'")
+                for c in Country.objects.filter(BAD_ISO_A2_Q).values("id", "slug", "iso_a2")[:sample]:
+                    out(f"  ! {c['id']} slug={c['slug']} iso_a2='{c['iso_a2']}'")
         else:
-            info.append("- iso_a2 format: OK")
+            out("- iso_a2 format: OK")
 
-        if bad_iso_a3_ids:
-            issues.append(f"Country.iso_a3 invalid: {len(bad_iso_a3_ids)}")
+        if country_agg["bad_a3"]:
+            issues.append(f"Country.iso_a3 invalid: {country_agg['bad_a3']}")
             if verbose:
-                for cid, slug, a3 in bad_iso_a3_ids[:sample]:
-                    info.append(f"  ! {cid} slug={slug} iso_a3='{a3}'")
+                for c in Country.objects.filter(BAD_ISO_A3_Q).values("id", "slug", "iso_a3")[:sample]:
+                    out(f"  ! {c['id']} slug={c['slug']} iso_a3='{c['iso_a3']}'")
         else:
-            info.append("- iso_a3 format: OK")
+            out("- iso_a3 format: OK")
 
         # iso_a3 duplicates (DB unique should prevent, but keep as a guard)
         dup_iso_a3 = (
@@ -131,20 +147,25 @@ class Command(BaseCommand):
             .filter(c__gt=1)
             .order_by("-c")
         )
-        if dup_iso_a3.exists():
-            issues.append(f"Country.iso_a3 duplicate groups: {dup_iso_a3.count()}")
+        dup_iso_a3_rows = list(dup_iso_a3) if country_agg["total"] else []
+        if dup_iso_a3_rows:
+            issues.append(f"Country.iso_a3 duplicate groups: {len(dup_iso_a3_rows)}")
             if verbose:
-                for row in dup_iso_a3[:sample]:
-                    info.append(f"  ! dup iso_a3='{row['iso_a3']}' count={row['c']}")
+                for row in dup_iso_a3_rows[:sample]:
+                    out(f"  ! dup iso_a3='{row['iso_a3']}' count={row['c']}")
         else:
-            info.append("- iso_a3 duplicates: OK")
+            out("- iso_a3 duplicates: OK")
 
         # -------------------------
         # Tag checks
         # -------------------------
-        info.append("\n[Tag]")
-        tag_count = Tag.objects.count()
-        info.append(f"- total: {tag_count}")
+        out("\n[Tag]")
+        tag_agg = Tag.objects.aggregate(
+            total=Count("id"),
+            missing_slug=Count("id", filter=Q(slug__isnull=True) | Q(slug="")),
+            missing_name=Count("id", filter=Q(name__isnull=True) | Q(name="")),
+        )
+        out(f"- total: {tag_agg['total']}")
 
         dup_tag_slugs = (
             Tag.objects.values("slug")
@@ -152,29 +173,30 @@ class Command(BaseCommand):
             .filter(c__gt=1)
             .order_by("-c")
         )
-        if dup_tag_slugs.exists():
-            issues.append(f"Tag.slug duplicate groups: {dup_tag_slugs.count()}")
+        dup_tag_rows = list(dup_tag_slugs) if tag_agg["total"] else []
+        if dup_tag_rows:
+            issues.append(f"Tag.slug duplicate groups: {len(dup_tag_rows)}")
             if verbose:
-                for row in dup_tag_slugs:
-                    info.append(f"  ! dup slug='{row['slug']}' count={row['c']}")
+                for row in dup_tag_rows:
+                    out(f"  ! dup slug='{row['slug']}' count={row['c']}")
         else:
-            info.append("- slug duplicates: OK")
+            out("- slug duplicates: OK")
 
-        missing_tag_slug = Tag.objects.filter(Q(slug__isnull=True) | Q(slug="")).count()
+        missing_tag_slug = tag_agg["missing_slug"]
         if missing_tag_slug:
             issues.append(f"Tag.slug missing: {missing_tag_slug}")
             if verbose:
-                info.append(f"  ! missing slug rows: {missing_tag_slug}")
+                out(f"  ! missing slug rows: {missing_tag_slug}")
         else:
-            info.append("- slug missing: OK")
+            out("- slug missing: OK")
 
-        missing_tag_name = Tag.objects.filter(Q(name__isnull=True) | Q(name="")).count()
+        missing_tag_name = tag_agg["missing_name"]
         if missing_tag_name:
             issues.append(f"Tag.name missing: {missing_tag_name}")
             if verbose:
-                info.append(f"  ! missing name rows: {missing_tag_name}")
+                out(f"  ! missing name rows: {missing_tag_name}")
         else:
-            info.append("- name missing: OK")
+            out("- name missing: OK")
 
         # name case-insensitive collisions (DB unique is case-sensitive on most DBs)
         dup_tag_name_ci = (
@@ -184,58 +206,79 @@ class Command(BaseCommand):
             .filter(c__gt=1)
             .order_by("-c")
         )
-        if dup_tag_name_ci.exists():
-            issues.append(f"Tag.name case-insensitive duplicate groups: {dup_tag_name_ci.count()}")
+        dup_tag_name_rows = list(dup_tag_name_ci) if tag_agg["total"] else []
+        if dup_tag_name_rows:
+            issues.append(f"Tag.name case-insensitive duplicate groups: {len(dup_tag_name_rows)}")
             if verbose:
-                for row in dup_tag_name_ci[:sample]:
-                    info.append(f"  ! dup (ci) name='{row['name_l']}' count={row['c']}")
+                for row in dup_tag_name_rows[:sample]:
+                    out(f"  ! dup (ci) name='{row['name_l']}' count={row['c']}")
         else:
-            info.append("- name case-insensitive duplicates: OK")
+            out("- name case-insensitive duplicates: OK")
 
         # slug should be slugified from name (or slugified-2, -3 ...)
         tag_slug_mismatch = []
-        for t in Tag.objects.all().only("id", "name", "slug").iterator():
-            expected = _smart_slugify(t.name)[:60]
+        # 문자열 비교만 하면 되므로 모델 hydrate 없이 raw tuple로 순회
+        tag_rows = (
+            Tag.objects.values_list("id", "name", "slug").iterator(chunk_size=1000)
+            if tag_agg["total"] else ()
+        )
+        for tid, name, slug in tag_rows:
+            expected = _smart_slugify(name)[:60]
             if not expected:
                 continue
-            if not (t.slug == expected or t.slug.startswith(expected + "-")):
-                tag_slug_mismatch.append((t.id, t.name, t.slug, expected))
+            if not (slug == expected or slug.startswith(expected + "-")):
+                tag_slug_mismatch.append((tid, name, slug, expected))
         if tag_slug_mismatch:
-            info.append(f"- slug/name mismatch (advisory): {len(tag_slug_mismatch)}")
+            out(f"- slug/name mismatch (advisory): {len(tag_slug_mismatch)}")
             if verbose:
                 for tid, name, slug, expected in tag_slug_mismatch[:sample]:
-                    info.append(f"  ! {tid} name='{name}' slug='{slug}' expected~='{expected}'")
+                    out(f"  ! {tid} name='{name}' slug='{slug}' expected~='{expected}'")
         else:
-            info.append("- slug aligns with name: OK")
+            out("- slug aligns with name: OK")
 
         # orphan tags (no posts)
-        orphan_tags = Tag.objects.annotate(pc=Count("posts")).filter(pc=0).count()
-        info.append(f"- orphan tags (0 posts): {orphan_tags}")
+        # JOIN+GROUP BY로 관계 행을 전부 세는 대신 anti-semi-join: 태그당 첫 매치에서 중단
+        orphan_tags = (
+            Tag.objects.annotate(
+                has_post=Exists(Post.tags.through.objects.filter(tag_id=OuterRef("pk")))
+            )
+            .filter(has_post=False)
+            .count()
+            if tag_agg["total"] else 0
+        )
+        out(f"- orphan tags (0 posts): {orphan_tags}")
 
         # -------------------------
         # Post checks
         # -------------------------
-        info.append("\n[Post]")
-        post_total = Post.objects.count()
-        post_pub = Post.objects.filter(is_published=True).count()
-        info.append(f"- total: {post_total} (published: {post_pub})")
+        out("\n[Post]")
+        post_agg = Post.objects.aggregate(
+            total=Count("id"),
+            pub=Count("id", filter=Q(is_published=True)),
+            missing_slug=Count("id", filter=Q(slug__isnull=True) | Q(slug="")),
+            non_lower_slug=Count("id", filter=~Q(slug=Lower("slug"))),
+            missing_published_at=Count("id", filter=Q(is_published=True, published_at__isnull=True)),
+        )
+        post_total = post_agg["total"]
+        post_pub = post_agg["pub"]
+        out(f"- total: {post_total} (published: {post_pub})")
 
-        missing_post_slug = Post.objects.filter(Q(slug__isnull=True) | Q(slug="")).count()
+        missing_post_slug = post_agg["missing_slug"]
         if missing_post_slug:
             issues.append(f"Post.slug missing: {missing_post_slug}")
             if verbose:
-                info.append(f"  ! missing slug rows: {missing_post_slug}")
+                out(f"  ! missing slug rows: {missing_post_slug}")
         else:
-            info.append("- slug missing: OK")
+            out("- slug missing: OK")
 
-        non_lower_post_slugs = Post.objects.exclude(slug=Lower("slug")).count()
+        non_lower_post_slugs = post_agg["non_lower_slug"]
         if non_lower_post_slugs:
             issues.append(f"Post.slug not lowercase: {non_lower_post_slugs}")
             if verbose:
-                for p in Post.objects.exclude(slug=Lower("slug")).only("id", "slug")[:sample]:
-                    info.append(f"  ! {p.id} slug='{p.slug}'")
+                for p in Post.objects.exclude(slug=Lower("slug")).values("id", "slug")[:sample]:
+                    out(f"  ! {p['id']} slug='{p['slug']}'")
         else:
-            info.append("- slug lowercase: OK")
+            out("- slug lowercase: OK")
 
         # Duplicate slug within (country, category) (even though Post.slug is globally unique)
         dup_post_slugs_scoped = (
@@ -244,84 +287,85 @@ class Command(BaseCommand):
             .filter(c__gt=1)
             .order_by("-c")
         )
-        if dup_post_slugs_scoped.exists():
+        dup_post_rows = list(dup_post_slugs_scoped) if post_total else []
+        if dup_post_rows:
             issues.append(
-                f"Post slug duplicates (country+category scope): {dup_post_slugs_scoped.count()}"
+                f"Post slug duplicates (country+category scope): {len(dup_post_rows)}"
             )
             if verbose:
-                for row in dup_post_slugs_scoped[:sample]:
-                    info.append(
+                for row in dup_post_rows[:sample]:
+                    out(
                         f"  ! dup country_id={row['country_id']} category={row['category']} slug='{row['slug']}' count={row['c']}"
                     )
         else:
-            info.append("- slug duplicates (country+category): OK")
+            out("- slug duplicates (country+category): OK")
 
         # Published posts missing published_at
-        missing_published_at = Post.objects.filter(is_published=True, published_at__isnull=True).count()
+        missing_published_at = post_agg["missing_published_at"]
         if missing_published_at:
             issues.append(f"Published posts missing published_at: {missing_published_at}")
             if verbose:
-                info.append(f"  ! published_at null rows: {missing_published_at}")
+                out(f"  ! published_at null rows: {missing_published_at}")
         else:
-            info.append("- published_at for published posts: OK")
+            out("- published_at for published posts: OK")
 
         # Tag relation sanity
-        pub_posts_with_tags = Post.objects.filter(is_published=True, tags__isnull=False).distinct().count()
-        info.append(f"- published posts with ≥1 tag: {pub_posts_with_tags}")
+        pub_posts_with_tags = (
+            Post.objects.filter(is_published=True, tags__isnull=False).distinct().count()
+            if post_pub else 0
+        )
+        out(f"- published posts with ≥1 tag: {pub_posts_with_tags}")
 
         # -------------------------
         # PostSlugHistory checks
         # -------------------------
-        info.append("\n[PostSlugHistory]")
+        out("\n[PostSlugHistory]")
         hist_total = PostSlugHistory.objects.count()
-        info.append(f"- total: {hist_total}")
+        out(f"- total: {hist_total}")
 
         # old_slug must not collide with any *other* current post slug in same (country, category)
-        collisions = []
-        for h in PostSlugHistory.objects.select_related("post", "country").only(
-            "id",
-            "country_id",
-            "category",
-            "old_slug",
-            "post_id",
-            "post__slug",
-        ).iterator():
-            if not h.old_slug:
-                continue
-
-            exists_other = Post.objects.filter(
-                country_id=h.country_id,
-                category=h.category,
-                slug=h.old_slug,
-            ).exclude(id=h.post_id).exists()
-            if exists_other:
-                collisions.append((h.id, h.country_id, h.category, h.old_slug, h.post_id))
-
-            if getattr(h.post, "slug", None) == h.old_slug:
-                collisions.append((h.id, h.country_id, h.category, h.old_slug, h.post_id))
-
-        if collisions:
-            issues.append(f"PostSlugHistory collisions/stale rows: {len(collisions)}")
+        # row별 exists() 서브쿼리(N+1) 대신 fix_slug_history와 같은 Exists 패턴으로 1쿼리 semi-join
+        bad_hist_qs = (
+            PostSlugHistory.objects.exclude(old_slug="")
+            .annotate(
+                collision=Exists(
+                    Post.objects.filter(
+                        country_id=OuterRef("country_id"),
+                        category=OuterRef("category"),
+                        slug=OuterRef("old_slug"),
+                    ).exclude(id=OuterRef("post_id"))
+                ),
+                stale=Exists(
+                    Post.objects.filter(id=OuterRef("post_id"), slug=OuterRef("old_slug"))
+                ),
+            )
+            .filter(Q(collision=True) | Q(stale=True))
+        )
+        bad_hist_count = bad_hist_qs.count() if hist_total else 0
+        if bad_hist_count:
+            issues.append(f"PostSlugHistory collisions/stale rows: {bad_hist_count}")
             if verbose:
-                for hid, cid, cat, old_slug, post_id in collisions[:sample]:
-                    info.append(
+                for hid, cid, cat, old_slug, post_id in bad_hist_qs.values_list(
+                    "id", "country_id", "category", "old_slug", "post_id"
+                )[:sample]:
+                    out(
                         f"  ! hist_id={hid} country_id={cid} category={cat} old_slug='{old_slug}' post_id={post_id}"
                     )
         else:
-            info.append("- collisions with current slugs: OK")
+            out("- collisions with current slugs: OK")
 
         # -------------------------
         # Output summary
         # -------------------------
-        info.append("\n[Summary]")
+        out("\n[Summary]")
         if issues:
-            info.append(f"- issues: {len(issues)}")
+            out(f"- issues: {len(issues)}")
             for it in issues:
-                info.append(f"  - {it}")
+                out(f"  - {it}")
         else:
-            info.append("- issues: 0 ✅")
+            out("- issues: 0 ✅")
 
-        _print_lines(info)
+        flush()
 
         if issues:
             self.stderr.write(self.style.ERROR("Audit finished with issues."))
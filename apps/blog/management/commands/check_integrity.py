@@ -2,9 +2,18 @@ from __future__ import annotations
 
 import json
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Any
 
+# 선택 의존성: 설치돼 있으면 대형 리포트 직렬화에 사용 (없어도 stdlib json으로 동작)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Prefetch
 from django.utils import timezone
 from django.utils.text import slugify
 
@@ -18,27 +27,36 @@ class Change:
     after: Any
 
 
-def _unique_slug(model_cls, base: str, *, instance_pk=None, max_len: int) -> str:
+@lru_cache(maxsize=8192)
+def _cached_slugify(s: str, allow_unicode: bool = False) -> str:
+    # 유니코드 정규화 비용이 있는 slugify를 동일 입력 반복 호출에서 memoize
+    return slugify(s, allow_unicode=allow_unicode)
+
+
+def _unique_slug(taken: set[str], base: str, *, max_len: int) -> str:
+    """후보가 `taken`에 없을 때까지 -2, -3 ... suffix를 붙인다.
+
+    기존 버전은 후보마다 exists() 쿼리를 날렸다(누락 행 × 재시도 횟수만큼 round-trip).
+    호출 측에서 슬러그 집합을 1쿼리로 미리 뽑아 넘기면 전부 메모리 lookup으로 끝난다.
+    선택된 슬러그는 taken에 추가해 같은 실행 내 중복을 막는다.
+    """
     base = (base or "").strip()
-    s = slugify(base)
+    s = _cached_slugify(base)
     if not s:
-        s = slugify(base, allow_unicode=True)
+        s = _cached_slugify(base, allow_unicode=True)
     s = (s or "item")[:max_len]
 
     candidate = s
     n = 2
-    while True:
-        qs = model_cls.objects.filter(slug=candidate)
-        if instance_pk is not None:
-            qs = qs.exclude(pk=instance_pk)
-        if not qs.exists():
-            return candidate
-
+    while candidate in taken:
         suffix = f"-{n}"
         cut = max_len - len(suffix)
         candidate = (s[:cut] if cut > 0 else s) + suffix
         n += 1
 
+    taken.add(candidate)
+    return candidate
+
 
 def _norm_iso(value: str | None) -> str | None:
     v = (value or "").strip().upper()
@@ -90,9 +108,14 @@ class Command(BaseCommand):
         # -----------------
         country_total = Country.objects.count()
         country_fixed = 0
+        # row별 save() 대신 bulk_update로 모아 쓰기 (수정은 기계적 정규화라 save 시그널 불필요)
+        touched_countries: list = []
+        country_changed_fields: set[str] = set()
+        # slug 채움에 쓸 기존 슬러그 집합 (fix 모드에서만 1쿼리)
+        country_taken: set[str] = set(Country.objects.values_list("slug", flat=True)) if fix else set()
 
         for c in Country.objects.all().order_by("id"):
-            update_fields: list[str] = []
+            update_fields: set[str] = set()
 
             # ISO normalization ('' -> NULL, strip, upper)
             iso_a2_new = _norm_iso(c.iso_a2)
@@ -102,13 +125,13 @@ class Command(BaseCommand):
                 changes.append(Change("Country", c.pk, "iso_a2", c.iso_a2, iso_a2_new))
                 if fix:
                     c.iso_a2 = iso_a2_new
-                    update_fields.append("iso_a2")
+                    update_fields.add("iso_a2")
 
             if iso_a3_new != c.iso_a3:
                 changes.append(Change("Country", c.pk, "iso_a3", c.iso_a3, iso_a3_new))
                 if fix:
                     c.iso_a3 = iso_a3_new
-                    update_fields.append("iso_a3")
+                    update_fields.add("iso_a3")
 
             # Conservative validity checks (do not guess corrections)
             if c.iso_a2 and len(c.iso_a2) != 2:
@@ -116,24 +139,24 @@ class Command(BaseCommand):
                 if fix:
                     changes.append(Change("Country", c.pk, "iso_a2", c.iso_a2, None))
                     c.iso_a2 = None
-                    update_fields.append("iso_a2")
+                    update_fields.add("iso_a2")
 
             if c.iso_a3 and len(c.iso_a3) != 3:
                 warnings.append({"model": "Country", "id": c.pk, "issue": "iso_a3_len", "value": c.iso_a3})
                 if fix:
                     changes.append(Change("Country", c.pk, "iso_a3", c.iso_a3, None))
                     c.iso_a3 = None
-                    update_fields.append("iso_a3")
+                    update_fields.add("iso_a3")
 
             # slug fill (unique)
             if not (c.slug or "").strip():
                 warnings.append({"model": "Country", "id": c.pk, "issue": "missing_slug"})
                 if fix:
                     base = (c.name_en or c.name or "country").strip()
-                    new_slug = _unique_slug(Country, base, instance_pk=c.pk, max_len=50)
+                    new_slug = _unique_slug(country_taken, base, max_len=50)
                     changes.append(Change("Country", c.pk, "slug", c.slug, new_slug))
                     c.slug = new_slug
-                    update_fields.append("slug")
+                    update_fields.add("slug")
 
             # aliases normalization
             aliases_new = _norm_aliases(c.aliases)
@@ -141,7 +164,7 @@ class Command(BaseCommand):
                 changes.append(Change("Country", c.pk, "aliases", c.aliases, aliases_new))
                 if fix:
                     c.aliases = aliases_new
-                    update_fields.append("aliases")
+                    update_fields.add("aliases")
 
             # trim name fields
             name_ko_new = (c.name_ko or "").strip()
@@ -150,34 +173,52 @@ class Command(BaseCommand):
                 changes.append(Change("Country", c.pk, "name_ko", c.name_ko, name_ko_new))
                 if fix:
                     c.name_ko = name_ko_new
-                    update_fields.append("name_ko")
+                    update_fields.add("name_ko")
             if name_en_new != (c.name_en or ""):
                 changes.append(Change("Country", c.pk, "name_en", c.name_en, name_en_new))
                 if fix:
                     c.name_en = name_en_new
-                    update_fields.append("name_en")
+                    update_fields.add("name_en")
 
             if fix and update_fields:
-                c.save(update_fields=list(set(update_fields)))
+                touched_countries.append(c)
+                country_changed_fields |= update_fields
                 country_fixed += 1
 
+        if touched_countries:
+            with transaction.atomic():
+                Country.objects.bulk_update(
+                    touched_countries,
+                    fields=sorted(country_changed_fields),
+                    batch_size=500,
+                )
+
         # -----------------
         # Posts
         # -----------------
         post_total = Post.objects.count()
         post_fixed = 0
         missing_image_tokens: list[dict[str, Any]] = []
-
-        for p in Post.objects.select_related("country").prefetch_related("images").all().order_by("id"):
-            update_fields: list[str] = []
+        touched_posts: list = []
+        post_changed_fields: set[str] = set()
+        post_taken: set[str] = set(Post.objects.values_list("slug", flat=True)) if fix else set()
+
+        # 전체 Post를 한 번에 hydrate하지 않도록 스트리밍 (Django>=4.1: prefetch_related + iterator(chunk_size) 조합 지원)
+        post_qs = (
+            Post.objects.select_related("country")
+            .prefetch_related(Prefetch("images", queryset=PostImage.objects.only("id", "post_id")))
+            .order_by("id")
+        )
+        for p in post_qs.iterator(chunk_size=500):
+            update_fields: set[str] = set()
 
             if not (p.slug or "").strip():
                 warnings.append({"model": "Post", "id": p.pk, "issue": "missing_slug"})
                 if fix:
-                    new_slug = _unique_slug(Post, p.title or "post", instance_pk=p.pk, max_len=220)
+                    new_slug = _unique_slug(post_taken, p.title or "post", max_len=220)
                     changes.append(Change("Post", p.pk, "slug", p.slug, new_slug))
                     p.slug = new_slug
-                    update_fields.append("slug")
+                    update_fields.add("slug")
 
             if p.is_published and not p.published_at:
                 warnings.append({"model": "Post", "id": p.pk, "issue": "missing_published_at"})
@@ -185,11 +226,12 @@ class Command(BaseCommand):
                     new_date = timezone.localdate()
                     changes.append(Change("Post", p.pk, "published_at", p.published_at, new_date))
                     p.published_at = new_date
-                    update_fields.append("published_at")
+                    update_fields.add("published_at")
 
             # Token ↔ 이미지 연결 체크(자동 수정은 하지 않음)
+            # values_list()는 prefetch 캐시를 안 타고 post마다 쿼리를 새로 날린다 — 캐시에서 직접 수집
             used = p.used_image_ids()
-            attached = set(p.images.values_list("id", flat=True))
+            attached = {im.id for im in p.images.all()}
             missing = sorted(list(used - attached))
             if missing:
                 missing_image_tokens.append({
@@ -200,9 +242,18 @@ class Command(BaseCommand):
                 })
 
             if fix and update_fields:
-                p.save(update_fields=list(set(update_fields)))
+                touched_posts.append(p)
+                post_changed_fields |= update_fields
                 post_fixed += 1
 
+        if touched_posts:
+            with transaction.atomic():
+                Post.objects.bulk_update(
+                    touched_posts,
+                    fields=sorted(post_changed_fields),
+                    batch_size=500,
+                )
+
         orphan_images = PostImage.objects.filter(post__isnull=True).count()
 
         report = {
@@ -228,7 +279,12 @@ class Command(BaseCommand):
         }
 
         if as_json:
-            self.stdout.write(json.dumps(report, ensure_ascii=False, indent=2))
+            if orjson is not None:
+                # orjson은 date/datetime을 네이티브로 처리하고 bytes로 바로 직렬화
+                self.stdout.write(orjson.dumps(report, option=orjson.OPT_INDENT_2).decode())
+            else:
+                # default=str: --fix 시 changes에 date(published_at)가 들어갈 수 있음
+                self.stdout.write(json.dumps(report, ensure_ascii=False, indent=2, default=str))
             return
 
         self.stdout.write(self.style.SUCCESS("Integrity check finished."))
@@ -4,7 +4,7 @@ from typing import Iterable
 
 from django.core.management.base import BaseCommand
 from django.db import transaction
-from django.db.models import Exists, OuterRef
+from django.db.models import BooleanField, Count, Exists, ExpressionWrapper, OuterRef, Q
 
 from apps.blog.models import Post, PostSlugHistory
 
@@ -48,57 +48,62 @@ class Command(BaseCommand):
         total = base_qs.count()
         lines.append(f"- total rows: {total}")
 
-        # 1) invalid old_slug
-        invalid_slug_qs = base_qs.exclude(old_slug__regex=VALID_SLUG_REGEX)
-        invalid_slug_ids = list(invalid_slug_qs.values_list("id", flat=True))
-
-        # 2) orphan rows (post missing) - should not happen on Postgres FK, but can exist if legacy/SQLite anomalies
-        orphan_qs = base_qs.annotate(
-            has_post=Exists(Post.objects.filter(id=OuterRef("post_id")))
-        ).filter(has_post=False)
-        orphan_ids = list(orphan_qs.values_list("id", flat=True))
-
-        # 3) collisions with current slugs for same (country, category)
-        collision_qs = base_qs.annotate(
-            collides=Exists(
+        # 카테고리별 플래그를 한 queryset에 annotate — id 리스트 4번 왕복 + 파이썬 set 합집합 제거
+        flagged_qs = base_qs.annotate(
+            # 1) invalid old_slug
+            is_invalid=ExpressionWrapper(
+                ~Q(old_slug__regex=VALID_SLUG_REGEX), output_field=BooleanField()
+            ),
+            # 2) orphan rows (post missing) - should not happen on Postgres FK, but can exist if legacy/SQLite anomalies
+            is_orphan=~Exists(Post.objects.filter(id=OuterRef("post_id"))),
+            # 3) collisions with current slugs for same (country, category)
+            is_collision=Exists(
                 Post.objects.filter(
                     country_id=OuterRef("country_id"),
                     category=OuterRef("category"),
                     slug=OuterRef("old_slug"),
                 ).exclude(id=OuterRef("post_id"))
-            )
-        ).filter(collides=True)
-        collision_ids = list(collision_qs.values_list("id", flat=True))
-
-        # 4) redundant rows: old_slug equals current slug of the same post in same (country, category)
-        redundant_ids: list[int] = []
-        # join을 쓰면 orphan row가 빠질 수 있으니(이미 orphan은 별도 탐지), 여기서는 post가 있는 row 위주로만 확인
-        for h in PostSlugHistory.objects.select_related("post").all():
-            p = getattr(h, "post", None)
-            if not p:
-                continue
-            if h.country_id == p.country_id and h.category == p.category and h.old_slug == p.slug:
-                redundant_ids.append(h.id)
-
-        # final delete set
-        to_delete = sorted(set(invalid_slug_ids) | set(orphan_ids) | set(collision_ids) | set(redundant_ids))
-        lines.append(f"- invalid old_slug: {len(invalid_slug_ids)}")
-        lines.append(f"- orphan rows: {len(orphan_ids)}")
-        lines.append(f"- collisions with current slugs: {len(collision_ids)}")
-        lines.append(f"- redundant rows: {len(redundant_ids)}")
-        lines.append(f"- to delete: {len(to_delete)}")
-
-        if verbose and to_delete:
+            ),
+            # 4) redundant: old_slug equals current slug of the same post in same (country, category)
+            #    (JOIN 대신 Exists — orphan row가 INNER JOIN에서 빠지는 문제 원천 차단)
+            is_redundant=Exists(
+                Post.objects.filter(
+                    id=OuterRef("post_id"),
+                    country_id=OuterRef("country_id"),
+                    category=OuterRef("category"),
+                    slug=OuterRef("old_slug"),
+                )
+            ),
+        )
+        bad_filter = (
+            Q(is_invalid=True) | Q(is_orphan=True) | Q(is_collision=True) | Q(is_redundant=True)
+        )
+        counts = flagged_qs.aggregate(
+            invalid=Count("id", filter=Q(is_invalid=True)),
+            orphan=Count("id", filter=Q(is_orphan=True)),
+            collision=Count("id", filter=Q(is_collision=True)),
+            redundant=Count("id", filter=Q(is_redundant=True)),
+            bad=Count("id", filter=bad_filter),
+        )
+        bad_qs = flagged_qs.filter(bad_filter)
+
+        lines.append(f"- invalid old_slug: {counts['invalid']}")
+        lines.append(f"- orphan rows: {counts['orphan']}")
+        lines.append(f"- collisions with current slugs: {counts['collision']}")
+        lines.append(f"- redundant rows: {counts['redundant']}")
+        lines.append(f"- to delete: {counts['bad']}")
+
+        if verbose and counts["bad"]:
             lines.append("\n[Samples]")
             # 최대 sample만 출력
-            for h in PostSlugHistory.objects.filter(id__in=to_delete).select_related("country")[:sample]:
+            for h in bad_qs.select_related("country").order_by("id")[:sample]:
                 lines.append(
                     f"  ! id={h.id} country_id={h.country_id} category={h.category} old_slug='{h.old_slug}' post_id={h.post_id}"
                 )
 
         _print(lines)
 
-        if not to_delete:
+        if not counts["bad"]:
             self.stdout.write(self.style.SUCCESS("No rows to fix."))
             return
 
@@ -106,14 +111,16 @@ class Command(BaseCommand):
             self.stderr.write(self.style.ERROR("Found problematic rows. Run with --apply to delete them."))
             raise SystemExit(1)
 
+        # pk 서브쿼리 삭제 1방 — id 리스트를 파이썬으로 올렸다 되돌리는 왕복(및 IN 파라미터 제한) 제거
         with transaction.atomic():
-            deleted_count, _ = PostSlugHistory.objects.filter(id__in=to_delete).delete()
+            deleted_count, _ = PostSlugHistory.objects.filter(
+                pk__in=bad_qs.values("pk")
+            ).delete()
 
         self.stdout.write(self.style.SUCCESS(f"Deleted {deleted_count} PostSlugHistory rows."))
 
-        # After apply, re-check quickly
-        remaining_issues = PostSlugHistory.objects.exclude(old_slug__regex=VALID_SLUG_REGEX).count()
-        if remaining_issues:
+        # After apply, re-check quickly (exists()는 첫 매치에서 중단 — count() 풀스캔 불필요)
+        if PostSlugHistory.objects.exclude(old_slug__regex=VALID_SLUG_REGEX).exists():
             self.stderr.write(self.style.ERROR("Some invalid-slug rows still remain after apply."))
             raise SystemExit(1)
 
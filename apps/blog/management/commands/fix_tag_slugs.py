@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+from functools import lru_cache
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils.text import slugify
+
+from apps.blog.models import Tag, TagSlugHistory
+
+
+MAX_SLUG_LEN = 60
+
+
+@lru_cache(maxsize=8192)
+def _smart_slugify(base: str) -> str:
+    """audit_content와 동일한 규칙 (fallback allow_unicode)."""
+    base = (base or "").strip()
+    s = slugify(base)
+    if not s:
+        s = slugify(base, allow_unicode=True)
+    return s or ""
+
+
+class Command(BaseCommand):
+    help = (
+        "Align Tag.slug with slugify(name) in a safe way.\n"
+        "- Default: dry-run (no DB change)\n"
+        "- Use --apply to rename slugs; old slugs go to TagSlugHistory for redirects\n"
+        "Rules:\n"
+        "  - slug == slugify(name) (or slugify(name)-N suffix) is considered aligned\n"
+        "  - a rename never takes a slug already used by another tag\n"
+        "  - old slug is recorded only when unambiguous (mirrors Tag.save's conservatism)\n"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--apply", action="store_true", help="Actually rename slugs (default: dry-run).")
+        parser.add_argument("--verbose", action="store_true", help="Print each planned rename.")
+        parser.add_argument("--sample", type=int, default=50, help="Max sample rows to print when --verbose is set.")
+
+    def handle(self, *args, **options):
+        apply: bool = bool(options.get("apply"))
+        verbose: bool = bool(options.get("verbose"))
+        sample: int = int(options.get("sample") or 50)
+
+        self.stdout.write("=== Fix Tag slugs (safe) ===")
+        self.stdout.write(f"- mode: {'APPLY' if apply else 'DRY-RUN'}")
+
+        # 1차 스캔은 raw tuple로 (전 태그를 모델 인스턴스로 hydrate하지 않음 — audit_content와 동일)
+        misaligned: list[tuple[int, str]] = []  # (id, expected)
+        for tid, name, slug in Tag.objects.order_by("id").values_list("id", "name", "slug"):
+            expected = _smart_slugify(name)[:MAX_SLUG_LEN]
+            if not expected:
+                continue
+            if slug == expected or slug.startswith(expected + "-"):
+                continue
+            misaligned.append((tid, expected))
+
+        self.stdout.write(f"- misaligned tags: {len(misaligned)}")
+
+        if not misaligned:
+            self.stdout.write(self.style.SUCCESS("Nothing to fix."))
+            return
+
+        # 고쳐야 할 태그만 인스턴스로 재조회 (bulk_update용)
+        candidate_ids = [tid for tid, _ in misaligned]
+        by_id = Tag.objects.in_bulk(candidate_ids)
+        candidates: list[tuple[Tag, str]] = [(by_id[tid], expected) for tid, expected in misaligned]
+
+        # 충돌 검사는 row별 exists() 대신 집합 2개를 미리 1쿼리씩 로드
+        taken_slugs: set[str] = set(
+            Tag.objects.exclude(id__in=candidate_ids).values_list("slug", flat=True)
+        )
+        taken_old_slugs: set[str] = set(
+            TagSlugHistory.objects.values_list("old_slug", flat=True)
+        )
+
+        to_update: list[Tag] = []
+        new_history: list[TagSlugHistory] = []
+        for t, expected in candidates:
+            new_slug = expected
+            n = 2
+            while new_slug in taken_slugs:
+                suffix = f"-{n}"
+                cut = MAX_SLUG_LEN - len(suffix)
+                new_slug = (expected[:cut] if cut > 0 else expected) + suffix
+                n += 1
+            taken_slugs.add(new_slug)
+
+            old_slug = (t.slug or "").strip()
+            t.slug = new_slug
+            to_update.append(t)
+
+            if verbose and len(to_update) <= sample:
+                self.stdout.write(f"  ! {t.id} name='{t.name}' '{old_slug}' -> '{new_slug}'")
+
+            # 옛 slug가 다른 태그의 현재 slug거나 이미 기록돼 있으면 건너뜀 (redirect ambiguity 방지)
+            if old_slug and old_slug not in taken_slugs and old_slug not in taken_old_slugs:
+                new_history.append(TagSlugHistory(tag=t, old_slug=old_slug))
+                taken_old_slugs.add(old_slug)
+
+        if not apply:
+            self.stderr.write(self.style.ERROR("Found misaligned slugs. Run with --apply to rename them."))
+            raise SystemExit(1)
+
+        # row별 save()/create() 대신 배치 2방 (Tag.save의 history 기록은 위에서 직접 수행)
+        with transaction.atomic():
+            Tag.objects.bulk_update(to_update, ["slug"], batch_size=1000)
+            TagSlugHistory.objects.bulk_create(new_history, batch_size=1000, ignore_conflicts=True)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Renamed {len(to_update)} tag slugs ({len(new_history)} history rows recorded)."
+        ))
+        return
@@ -2,8 +2,27 @@
 from __future__ import annotations
 
 import json
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, Optional, Set
+from typing import Any, Dict, Iterable, Optional, Set
+
+# 선택 의존성: 있으면 GeoJSON을 스트리밍 파싱 (geometry를 파이썬 객체로 만들지 않음)
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# 선택 의존성: 있으면 JSON 파싱 가속 (bytes를 바로 받아 read_text 디코드 생략)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _load_json(path: Path) -> Any:
+    if orjson is not None:
+        return orjson.loads(path.read_bytes())
+    return json.loads(path.read_text(encoding="utf-8"))
 
 from django.core.management.base import BaseCommand
 from django.db import transaction
@@ -12,8 +31,36 @@ from django.utils.text import slugify
 from apps.blog.models import Country
 
 
+@lru_cache(maxsize=4096)
+def _cached_slugify(s: str) -> str:
+    # slugify는 유니코드 정규화 비용이 있음 — 같은 영문명 재호출(재임포트/충돌 재시도)은 memoize
+    return slugify(s)
+
+
+# 데이터셋마다 프로퍼티 키가 달라서 후보를 여러 개 둠 (모듈 상수: feature마다 튜플 재생성 안 함)
+_ISO2_KEYS = ("ISO_A2", "ISO3166-1-Alpha-2", "iso_a2")
+_ISO3_KEYS = ("ISO_A3", "ISO3166-1-Alpha-3", "iso_a3", "ADM0_A3")
+_EN_NAME_KEYS = ("ADMIN", "NAME_EN", "NAME", "name", "SOVEREIGNT", "FORMAL_EN")
+
+
+def _pick_prop(props: Dict[str, Any], keys: tuple) -> str:
+    for k in keys:
+        v = props.get(k)
+        if v:
+            s = str(v).strip()
+            if s:
+                return s
+    return ""
+
+
 def _norm_alias(s: str) -> str:
-    return " ".join((s or "").strip().split())
+    if not s:
+        return ""
+    s = s.strip()
+    # 내부 공백 run이 없는 보통 케이스는 split/join 재조립을 건너뜀
+    if " " not in s and "\t" not in s:
+        return s
+    return " ".join(s.split())
 
 
 def _safe_upper(s: Optional[str]) -> str:
@@ -67,13 +114,23 @@ class Command(BaseCommand):
             if not ko_map_path.exists():
                 self.stderr.write(self.style.ERROR(f"ko-map not found: {ko_map_path}"))
                 return
-            ko_map = json.loads(ko_map_path.read_text(encoding="utf-8"))
-
-        data = json.loads(geojson_path.read_text(encoding="utf-8"))
-        features = data.get("features") or []
-        if not isinstance(features, list):
-            self.stderr.write(self.style.ERROR("Invalid GeoJSON: features is not a list"))
-            return
+            ko_map = _load_json(ko_map_path)
+
+        # 세계 지도 GeoJSON은 대부분 우리가 읽지도 않는 geometry 좌표 —
+        # ijson이 있으면 feature 단위로 스트리밍해 피크 메모리를 O(파일) → O(feature 1개)로 줄인다
+        features: Iterable[Dict[str, Any]]
+        if ijson is not None:
+            def _iter_features():
+                with geojson_path.open("rb") as f:
+                    yield from ijson.items(f, "features.item")
+
+            features = _iter_features()
+        else:
+            data = _load_json(geojson_path)
+            features = data.get("features") or []
+            if not isinstance(features, list):
+                self.stderr.write(self.style.ERROR("Invalid GeoJSON: features is not a list"))
+                return
 
         created = 0
         updated = 0
@@ -82,13 +139,11 @@ class Command(BaseCommand):
         # slug 충돌 방지용
         existing_slugs: Set[str] = set(Country.objects.values_list("slug", flat=True))
 
-        def choose_english_name(props: Dict[str, Any]) -> str:
-            # 데이터셋마다 영어 필드 이름이 달라서 후보를 여러 개 둠
-            for k in ("ADMIN", "NAME_EN", "NAME", "name", "SOVEREIGNT", "FORMAL_EN"):
-                v = (props.get(k) or "").strip()
-                if v:
-                    return v
-            return ""
+        # upsert 대상 조회도 feature마다 SELECT 1방 대신 iso_a3 -> Country 딕셔너리 1방
+        existing_by_a3: Dict[str, Country] = {
+            c.iso_a3: c
+            for c in Country.objects.exclude(iso_a3__isnull=True).exclude(iso_a3="")
+        }
 
         def build_display_name(ko: str, en: str) -> str:
             ko = (ko or "").strip()
@@ -103,10 +158,10 @@ class Command(BaseCommand):
             if slug_mode == "iso2" and iso_a2:
                 base = iso_a2.lower()
             elif slug_mode == "slugify_en":
-                base = slugify(en_name) or (iso_a2.lower() if iso_a2 else "")
+                base = _cached_slugify(en_name) or (iso_a2.lower() if iso_a2 else "")
             else:
                 # keep 모드에서는 "새로 생성할 때만" fallback로 iso2를 씀
-                base = iso_a2.lower() if iso_a2 else (slugify(en_name) or "")
+                base = iso_a2.lower() if iso_a2 else (_cached_slugify(en_name) or "")
 
             if not base:
                 base = "country"
@@ -123,34 +178,20 @@ class Command(BaseCommand):
         def run():
             nonlocal created, updated, skipped
 
+            # feature마다 INSERT/UPDATE 1방씩 날리지 않고 모아서 배치로 기록
+            # (ISO 정규화/slug는 이 커맨드가 직접 세팅하므로 Country.save()를 거칠 필요 없음)
+            to_create: list[Country] = []
+            to_update: list[Country] = []
+
             for feat in features:
                 props = (feat.get("properties") or {})
                 if not isinstance(props, dict):
                     skipped += 1
                     continue
 
-                def pick_prop(props, *keys):
-                    for k in keys:
-                        v = props.get(k)
-                        if v is not None and str(v).strip():
-                            return str(v).strip()
-                    return ""
-                
-                iso_a2 = _safe_upper(pick_prop(
-                    props,
-                    "ISO_A2",
-                    "ISO3166-1-Alpha-2",
-                    "iso_a2",
-                ))
-                
-                iso_a3 = _safe_upper(pick_prop(
-                    props,
-                    "ISO_A3",
-                    "ISO3166-1-Alpha-3",
-                    "iso_a3",
-                    "ADM0_A3",
-                ))
-                en = choose_english_name(props)
+                iso_a2 = _safe_upper(_pick_prop(props, _ISO2_KEYS))
+                iso_a3 = _safe_upper(_pick_prop(props, _ISO3_KEYS))
+                en = _pick_prop(props, _EN_NAME_KEYS)
 
                 if not iso_a3 or not en:
                     skipped += 1
@@ -169,14 +210,17 @@ class Command(BaseCommand):
                 display_name = display_override or build_display_name(ko, en)
 
                 # aliases 기본 구성(대소문자는 globe.js가 정규화하므로 하나만 있어도 됨)
-                aliases = set()
-                for v in (en, iso_a2, iso_a3, props.get("FORMAL_EN"), props.get("NAME_LONG")):
-                    t = _norm_alias(str(v or ""))
-                    if t:
-                        aliases.add(t)
-
-                # 기존 행 찾기: iso_a3 기준(upsert)
-                obj = Country.objects.filter(iso_a3=iso_a3).first()
+                aliases = {
+                    a
+                    for a in (
+                        _norm_alias(str(v or ""))
+                        for v in (en, iso_a2, iso_a3, props.get("FORMAL_EN"), props.get("NAME_LONG"))
+                    )
+                    if a
+                }
+
+                # 기존 행 찾기: iso_a3 기준(upsert) — 미리 로드한 딕셔너리에서 조회
+                obj = existing_by_a3.get(iso_a3)
 
                 if obj:
                     if not update_existing:
@@ -184,6 +228,11 @@ class Command(BaseCommand):
                         skipped += 1
                         continue
 
+                    if obj.pk is None:
+                        # 같은 실행에서 생성 예약된 iso_a3의 중복 feature — 한 번만 처리
+                        skipped += 1
+                        continue
+
                     # slug는 keep 모드에서는 절대 변경하지 않음
                     if slug_mode != "keep" and (not obj.slug):
                         obj.slug = default_slug(iso_a2, en)
@@ -201,9 +250,7 @@ class Command(BaseCommand):
                     merged = sorted(old_aliases.union(aliases))
                     obj.aliases = ", ".join(merged)
 
-                    if not dry_run:
-                        obj.save()
-
+                    to_update.append(obj)
                     updated += 1
                     continue
 
@@ -219,11 +266,18 @@ class Command(BaseCommand):
                     aliases=", ".join(sorted(aliases)),
                 )
 
-                if not dry_run:
-                    obj.save()
-
+                to_create.append(obj)
+                existing_by_a3[iso_a3] = obj  # 중복 feature가 다시 생성하지 않도록
                 created += 1
 
+            if not dry_run:
+                Country.objects.bulk_create(to_create, batch_size=500)
+                Country.objects.bulk_update(
+                    to_update,
+                    ["iso_a2", "name_ko", "name_en", "name", "aliases", "slug"],
+                    batch_size=500,
+                )
+
         run()
 
         self.stdout.write(self.style.SUCCESS(
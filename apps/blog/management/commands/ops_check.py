@@ -2,10 +2,17 @@ from __future__ import annotations
 
 import json
 import os
+from collections import Counter
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Dict, List
 
+# 선택 의존성: 있으면 --json 출력 직렬화 가속 (check_integrity와 동일한 패턴)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from django.conf import settings
 from django.core.management.base import BaseCommand
 from django.db import connection
@@ -20,11 +27,6 @@ class CheckItem:
     meta: Dict[str, Any] | None = None
 
 
-def _env_exists(name: str) -> bool:
-    v = os.environ.get(name)
-    return v is not None and str(v).strip() != ""
-
-
 def _static_manifest_expected() -> bool:
     backend = ""
     try:
@@ -45,17 +47,31 @@ class Command(BaseCommand):
     def add_arguments(self, parser):
         parser.add_argument("--json", action="store_true", help="Print machine-readable JSON.")
         parser.add_argument("--strict", action="store_true", help="Exit non-zero if any ERROR is found.")
+        parser.add_argument(
+            "--skip-migrations",
+            action="store_true",
+            help="Skip the migration-plan check (it parses every migration module; useful for fast liveness probes).",
+        )
 
     def handle(self, *args, **options):
         as_json = bool(options["json"])
         strict = bool(options["strict"])
+        skip_migrations = bool(options["skip_migrations"])
 
         items: List[CheckItem] = []
 
+        # env/settings는 한 번만 스냅샷 (어떤 키를 읽는지도 여기로 모임)
+        env = os.environ
+
+        def has(name: str) -> bool:
+            return bool((env.get(name) or "").strip())
+
+        debug = bool(settings.DEBUG)
+
         # 1) Settings / env
-        items.append(CheckItem("django.DEBUG", "OK", f"DEBUG={settings.DEBUG}"))
+        items.append(CheckItem("django.DEBUG", "OK", f"DEBUG={debug}"))
 
-        if _env_exists("SECRET_KEY") or getattr(settings, "SECRET_KEY", ""):
+        if has("SECRET_KEY") or getattr(settings, "SECRET_KEY", ""):
             items.append(CheckItem("env.SECRET_KEY", "OK", "SECRET_KEY is set (value hidden)."))
         else:
             items.append(CheckItem("env.SECRET_KEY", "ERROR", "SECRET_KEY is missing."))
@@ -66,7 +82,7 @@ class Command(BaseCommand):
         else:
             items.append(CheckItem("django.ALLOWED_HOSTS", "WARN", "ALLOWED_HOSTS is empty. DisallowedHost likely in prod."))
 
-        if _env_exists("DATABASE_URL"):
+        if has("DATABASE_URL"):
             items.append(CheckItem("env.DATABASE_URL", "OK", "DATABASE_URL is set (value hidden)."))
         else:
             items.append(CheckItem("env.DATABASE_URL", "WARN", "DATABASE_URL not set. DB may still be configured via other settings."))
@@ -74,14 +90,14 @@ class Command(BaseCommand):
         use_cloudinary = bool(getattr(settings, "USE_CLOUDINARY", False))
         cloud_meta = {"USE_CLOUDINARY": use_cloudinary}
         if use_cloudinary:
-            cred_ok = _env_exists("CLOUDINARY_URL") or (
-                _env_exists("CLOUDINARY_CLOUD_NAME") and _env_exists("CLOUDINARY_API_KEY") and _env_exists("CLOUDINARY_API_SECRET")
+            cred_ok = has("CLOUDINARY_URL") or (
+                has("CLOUDINARY_CLOUD_NAME") and has("CLOUDINARY_API_KEY") and has("CLOUDINARY_API_SECRET")
             )
             cloud_meta.update({
-                "CLOUDINARY_URL": _env_exists("CLOUDINARY_URL"),
-                "CLOUDINARY_CLOUD_NAME": _env_exists("CLOUDINARY_CLOUD_NAME"),
-                "CLOUDINARY_API_KEY": _env_exists("CLOUDINARY_API_KEY"),
-                "CLOUDINARY_API_SECRET": _env_exists("CLOUDINARY_API_SECRET"),
+                "CLOUDINARY_URL": has("CLOUDINARY_URL"),
+                "CLOUDINARY_CLOUD_NAME": has("CLOUDINARY_CLOUD_NAME"),
+                "CLOUDINARY_API_KEY": has("CLOUDINARY_API_KEY"),
+                "CLOUDINARY_API_SECRET": has("CLOUDINARY_API_SECRET"),
             })
             items.append(CheckItem(
                 "cloudinary.credentials",
@@ -99,7 +115,7 @@ class Command(BaseCommand):
         else:
             items.append(CheckItem(
                 "static.STATIC_ROOT",
-                "WARN" if settings.DEBUG else "ERROR",
+                "WARN" if debug else "ERROR",
                 f"STATIC_ROOT missing or not created: {static_root or '(empty)'}",
             ))
 
@@ -113,30 +129,19 @@ class Command(BaseCommand):
             items.append(CheckItem("static.manifest", "OK", "Manifest not required for current staticfiles storage backend."))
 
         # 3) DB connectivity
+        # SELECT 1 왕복 대신 핸드셰이크만 검증 (쿼리 1 round-trip 절약; 접속 가능 여부가 원래 목적)
         try:
-            with connection.cursor() as cursor:
-                cursor.execute("SELECT 1;")
-                cursor.fetchone()
+            connection.ensure_connection()
             items.append(CheckItem("db.connection", "OK", f"Connected to DB: {connection.settings_dict.get('NAME')}"))
         except OperationalError as e:
             items.append(CheckItem("db.connection", "ERROR", "DB connection failed.", {"error": str(e)}))
 
         # 4) Migrations
-        try:
-            from django.db.migrations.executor import MigrationExecutor
-            executor = MigrationExecutor(connection)
-            plan = executor.migration_plan(executor.loader.graph.leaf_nodes())
-            if plan:
-                items.append(CheckItem(
-                    "db.migrations",
-                    "WARN" if settings.DEBUG else "ERROR",
-                    f"{len(plan)} unapplied migration(s).",
-                    {"count": len(plan), "sample": [f"{m.app_label}.{m.name}" for m, _ in plan[:10]]},
-                ))
-            else:
-                items.append(CheckItem("db.migrations", "OK", "No unapplied migrations."))
-        except Exception as e:
-            items.append(CheckItem("db.migrations", "WARN", "Could not evaluate migration plan.", {"error": str(e)}))
+        # MigrationExecutor는 디스크의 모든 migration 모듈을 파싱하므로 빠른 liveness probe에서는 생략 가능
+        if skip_migrations:
+            items.append(CheckItem("db.migrations", "OK", "Skipped (--skip-migrations)."))
+        else:
+            items.append(self._migration_check(debug))
 
         # 5) Seed safety (SeedMeta)
         try:
@@ -154,14 +159,18 @@ class Command(BaseCommand):
         except Exception as e:
             items.append(CheckItem("seed.meta", "WARN", "SeedMeta check unavailable.", {"error": str(e)}))
 
+        # status 집계는 Counter 1패스 — errors 리스트만 strict 모드용으로 실체화
+        counts = Counter(it.status for it in items)
         errors = [it for it in items if it.status == "ERROR"]
-        warns = [it for it in items if it.status == "WARN"]
 
-        summary = {"ok": len([it for it in items if it.status == "OK"]), "warn": len(warns), "error": len(errors), "debug": bool(settings.DEBUG)}
+        summary = {"ok": counts["OK"], "warn": counts["WARN"], "error": counts["ERROR"], "debug": debug}
 
         if as_json:
             payload = {"summary": summary, "items": [{"key": it.key, "status": it.status, "message": it.message, "meta": it.meta or {}} for it in items]}
-            self.stdout.write(json.dumps(payload, ensure_ascii=False, indent=2))
+            if orjson is not None:
+                self.stdout.write(orjson.dumps(payload, option=orjson.OPT_INDENT_2).decode())
+            else:
+                self.stdout.write(json.dumps(payload, ensure_ascii=False, indent=2))
         else:
             self.stdout.write(self.style.MIGRATE_HEADING("ops_check results"))
             self.stdout.write(f"- OK: {summary['ok']}  WARN: {summary['warn']}  ERROR: {summary['error']}")
@@ -173,3 +182,19 @@ class Command(BaseCommand):
 
         if strict and errors:
             raise SystemExit(2)
+
+    def _migration_check(self, debug: bool) -> CheckItem:
+        try:
+            from django.db.migrations.executor import MigrationExecutor
+            executor = MigrationExecutor(connection)
+            plan = executor.migration_plan(executor.loader.graph.leaf_nodes())
+            if plan:
+                return CheckItem(
+                    "db.migrations",
+                    "WARN" if debug else "ERROR",
+                    f"{len(plan)} unapplied migration(s).",
+                    {"count": len(plan), "sample": [f"{m.app_label}.{m.name}" for m, _ in plan[:10]]},
+                )
+            return CheckItem("db.migrations", "OK", "No unapplied migrations.")
+        except Exception as e:
+            return CheckItem("db.migrations", "WARN", "Could not evaluate migration plan.", {"error": str(e)})
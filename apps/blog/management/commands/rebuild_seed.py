@@ -29,18 +29,17 @@ class Command(BaseCommand):
         out_path = (Path.cwd() / out).resolve()
         out_path.parent.mkdir(parents=True, exist_ok=True)
 
-        # dumpdata는 stdout으로 내보낼 수 있으니,
-        # 파일 핸들을 UTF-8로 열어주면 Windows에서도 charmap 문제를 피할 수 있음.
+        # dumpdata의 --output은 스스로 UTF-8로 직접/스트리밍 기록하므로
+        # stdout 프록시를 거치는 이중 버퍼링 없이도 Windows charmap 문제를 피할 수 있음.
         self.stdout.write(self.style.WARNING(f"Rebuilding fixture to: {out_path} (UTF-8)"))
 
-        with out_path.open("w", encoding="utf-8", newline="\n") as f:
-            call_command(
-                "dumpdata",
-                "blog.Country",
-                "blog.Post",
-                "blog.PostImage",
-                indent=indent,
-                stdout=f,
-            )
+        call_command(
+            "dumpdata",
+            "blog.Country",
+            "blog.Post",
+            "blog.PostImage",
+            indent=indent,
+            output=str(out_path),
+        )
 
         self.stdout.write(self.style.SUCCESS("Fixture rebuilt OK."))
@@ -1,19 +1,31 @@
 from __future__ import annotations
 
 import hashlib
+import json
 from pathlib import Path
+from typing import Any
+
+# 선택 의존성: 있으면 fixture를 통째로 파싱하지 않고 object 단위로 스트리밍 (import_countries와 동일)
+try:
+    import ijson
+except ImportError:
+    ijson = None
 
 from django.core.management import call_command
 from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
 from django.utils import timezone
 
 
 def _sha256_file(path: Path) -> str:
-    h = hashlib.sha256()
     with path.open("rb") as f:
+        # Python 3.11+: 파이썬 bytes 버퍼를 거치지 않고 fd에서 바로 해싱 (GIL도 해제)
+        if hasattr(hashlib, "file_digest"):
+            return hashlib.file_digest(f, "sha256").hexdigest()
+        h = hashlib.sha256()
         for chunk in iter(lambda: f.read(1024 * 1024), b""):
             h.update(chunk)
-    return h.hexdigest()
+        return h.hexdigest()
 
 
 class Command(BaseCommand):
@@ -30,6 +42,12 @@ class Command(BaseCommand):
             action="store_true",
             help="Delete blog tables (PostImage/Post/Country) before loading fixture",
         )
+        parser.add_argument(
+            "--bulk",
+            action="store_true",
+            help="Insert fixture rows with bulk_create instead of loaddata's per-object save(). "
+                 "Much faster on large fixtures, but insert-only (no upsert of existing pks) — use with --wipe or on an empty DB.",
+        )
         parser.add_argument(
             "--force",
             action="store_true",
@@ -40,6 +58,7 @@ class Command(BaseCommand):
         fixture = options["fixture"]
         wipe = bool(options["wipe"])
         force = bool(options["force"])
+        bulk = bool(options["bulk"])
 
         base_dir = Path.cwd()
         fixture_path = (base_dir / fixture).resolve()
@@ -53,12 +72,26 @@ class Command(BaseCommand):
         # ----
         # SeedMeta 기반 '멱등성' 체크
         # ----
-        fixture_hash = _sha256_file(fixture_path)
-
         meta, _created = SeedMeta.objects.get_or_create(name="prod_seed")
         prev_hash = (meta.fixture_sha256 or "").strip()
 
-        has_any = Country.objects.exists() or Post.objects.exists() or PostImage.objects.exists()
+        # (mtime_ns, size)가 지난 적용 때와 같으면 파일이 안 바뀐 것 — 전체 재해싱 생략
+        st = fixture_path.stat()
+        stat_fp = [st.st_mtime_ns, st.st_size]
+        notes = meta.notes if isinstance(meta.notes, dict) else {}
+        if prev_hash and meta.fixture_path == str(fixture) and notes.get("stat_fp") == stat_fp:
+            fixture_hash = prev_hash
+        else:
+            fixture_hash = _sha256_file(fixture_path)
+
+        # 테이블 3개 exists()를 각각 날리면 최악 3 round-trip — EXISTS 분리절 하나로 합침 (DB가 첫 hit에서 단락)
+        exists_sql = " OR ".join(
+            f"EXISTS(SELECT 1 FROM {connection.ops.quote_name(m._meta.db_table)})"
+            for m in (Country, Post, PostImage)
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT {exists_sql}")
+            has_any = bool(cursor.fetchone()[0])
 
         if prev_hash:
             if prev_hash == fixture_hash:
@@ -95,41 +128,112 @@ class Command(BaseCommand):
                 )
                 return
 
-        # ----
-        # Wipe (예측 가능한 초기화)
-        # ----
-        if wipe:
-            self.stdout.write(self.style.WARNING("Wiping blog tables: PostImage -> Post -> Country"))
-            PostImage.objects.all().delete()
-            Post.objects.all().delete()
-            Country.objects.all().delete()
+        # wipe ~ loaddata ~ fix ~ SeedMeta 기록을 트랜잭션 하나로 묶음:
+        # 중간에 죽어도 '지워졌는데 못 채운' 상태가 남지 않고(all-or-nothing),
+        # loaddata가 row별 autocommit 대신 한 커밋으로 처리돼 fsync 비용도 크게 줄어듦.
+        with transaction.atomic():
+            # ----
+            # Wipe (예측 가능한 초기화)
+            # ----
+            if wipe:
+                self.stdout.write(self.style.WARNING("Wiping blog tables: PostImage -> Post -> Country"))
+                if connection.vendor == "postgresql":
+                    # TRUNCATE는 row별 MVCC/시그널 처리 없이 메타데이터 연산으로 비움 — 대량 wipe에서 압도적
+                    tables = ", ".join(
+                        connection.ops.quote_name(m._meta.db_table)
+                        for m in (PostImage, Post, Country)
+                    )
+                    with connection.cursor() as cursor:
+                        cursor.execute(f"TRUNCATE TABLE {tables} RESTART IDENTITY CASCADE")
+                else:
+                    # SQLite 등 TRUNCATE 미지원 백엔드는 기존 cascade delete 유지
+                    PostImage.objects.all().delete()
+                    Post.objects.all().delete()
+                    Country.objects.all().delete()
+
+            # ----
+            # Load fixture
+            # ----
+            if bulk:
+                # loaddata는 object마다 save() 1방 — bulk_create 배치로 INSERT 횟수를 1/1000로
+                self.stdout.write(self.style.SUCCESS(f"Loading fixture (bulk): {fixture_path}"))
+                n = self._bulk_load_fixture(fixture_path)
+                self.stdout.write(self.style.SUCCESS(f"Installed {n} object(s) via bulk_create"))
+            else:
+                self.stdout.write(self.style.SUCCESS(f"Loading fixture: {fixture_path}"))
+                call_command("loaddata", str(fixture_path))
+
+            # ----
+            # Phase 1-Step 1: 정합성 점검/보수적 정규화(자동 수정은 안전 범위만)
+            # ----
+            try:
+                self.stdout.write(self.style.WARNING("Running integrity check (--fix)..."))
+                # savepoint: fix가 중간에 죽어도 seed 본체(loaddata)는 살아서 커밋됨
+                with transaction.atomic():
+                    call_command("check_integrity", "--fix")
+            except Exception as e:
+                self.stdout.write(self.style.ERROR(f"Integrity check failed (seed continues): {e}"))
+
+            # ----
+            # SeedMeta 기록(멱등성 보장용)
+            # ----
+            # count() 3방 대신 스칼라 서브쿼리 3개를 한 SELECT로 — round-trip 1회
+            count_sql = ", ".join(
+                f"(SELECT count(*) FROM {connection.ops.quote_name(m._meta.db_table)})"
+                for m in (Country, Post, PostImage)
+            )
+            with connection.cursor() as cursor:
+                cursor.execute(f"SELECT {count_sql}")
+                n_countries, n_posts, n_images = cursor.fetchone()
+
+            meta.fixture_path = str(fixture)
+            meta.fixture_sha256 = fixture_hash
+            meta.applied_at = timezone.now()
+            meta.notes = {
+                "countries": n_countries,
+                "posts": n_posts,
+                "post_images": n_images,
+                "stat_fp": stat_fp,
+            }
+            meta.save(update_fields=["fixture_path", "fixture_sha256", "applied_at", "notes"])
 
-        # ----
-        # Load fixture
-        # ----
-        self.stdout.write(self.style.SUCCESS(f"Loading fixture: {fixture_path}"))
-        call_command("loaddata", str(fixture_path))
+        self.stdout.write(self.style.SUCCESS("Seed finished OK."))
 
-        # ----
-        # Phase 1-Step 1: 정합성 점검/보수적 정규화(자동 수정은 안전 범위만)
-        # ----
-        try:
-            self.stdout.write(self.style.WARNING("Running integrity check (--fix)..."))
-            call_command("check_integrity", "--fix")
-        except Exception as e:
-            self.stdout.write(self.style.ERROR(f"Integrity check failed (seed continues): {e}"))
+    def _bulk_load_fixture(self, fixture_path: Path) -> int:
+        """
+        Django fixture(JSON)를 serializer로 역직렬화해 모델별로 모아 bulk_create한다.
+        - ijson이 있으면 object 단위 스트리밍, 없으면 통째로 파싱
+        - save()/시그널을 거치지 않는 insert-only 경로 (slug 등은 fixture 값 그대로)
+        - m2m(예: Post.tags)은 insert 후 set()으로 채움
+        """
+        from django.core.serializers.python import Deserializer as PythonDeserializer
+
+        if ijson is not None:
+            def _iter_items():
+                with fixture_path.open("rb") as f:
+                    yield from ijson.items(f, "item")
+
+            raw = _iter_items()
+        else:
+            raw = json.loads(fixture_path.read_text(encoding="utf-8"))
 
-        # ----
-        # SeedMeta 기록(멱등성 보장용)
-        # ----
-        meta.fixture_path = str(fixture)
-        meta.fixture_sha256 = fixture_hash
-        meta.applied_at = timezone.now()
-        meta.notes = {
-            "countries": Country.objects.count(),
-            "posts": Post.objects.count(),
-            "post_images": PostImage.objects.count(),
-        }
-        meta.save(update_fields=["fixture_path", "fixture_sha256", "applied_at", "notes"])
+        # fixture는 rebuild_seed가 FK 순서(Country → Post → PostImage)로 덤프하므로
+        # 등장 순서대로 모델별 버퍼를 유지하면 FK 순서가 지켜진다
+        groups: dict[type, list] = {}
+        m2m_pending: list[tuple[Any, dict]] = []
+        total = 0
 
-        self.stdout.write(self.style.SUCCESS("Seed finished OK."))
+        for d in PythonDeserializer(raw):
+            groups.setdefault(type(d.object), []).append(d.object)
+            if d.m2m_data:
+                m2m_pending.append((d.object, d.m2m_data))
+
+        for model, objs in groups.items():
+            model.objects.bulk_create(objs, batch_size=1000)
+            total += len(objs)
+
+        for obj, data in m2m_pending:
+            for field, values in data.items():
+                getattr(obj, field).set(values)
+
+        return total
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.17 on 2026-08-28 20:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0012_tag_slug_history'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['country', 'category', 'slug'], name='post_cc_slug_idx'),
+        ),
+    ]
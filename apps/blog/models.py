@@ -1,15 +1,77 @@
+from django.core.cache import cache
 from django.db import models
 from django.utils import timezone
 from django.utils.text import slugify  # ✅ 필수: defaultfilters.slugify 금지
 
 import markdown as md
 import bleach
+from bleach.linkifier import LinkifyFilter
 import re
 import html
+import threading
+from functools import partial
 from django.db.models import Max
 from django.db import IntegrityError
 
 
+# bleach 허용 목록은 상수 — 렌더마다 set union/dict merge를 다시 만들지 않는다
+_ALLOWED_TAGS = frozenset(bleach.sanitizer.ALLOWED_TAGS | {
+    "p", "br", "hr",
+    "h1", "h2", "h3", "h4",
+    "ul", "ol", "li",
+    "blockquote",
+    "pre", "code",
+    "table", "thead", "tbody", "tr", "th", "td",
+    "img",
+    "figure", "figcaption",
+})
+
+_ALLOWED_ATTRS = {
+    **bleach.sanitizer.ALLOWED_ATTRIBUTES,
+    "a": ["href", "title", "target", "rel"],
+    "img": ["src", "alt", "title", "class", "loading", "decoding", "width", "height", "data-full", "data-caption"],
+    "figure": ["class"],
+    "figcaption": ["class"],
+    "th": ["align"],
+    "td": ["align"],
+}
+
+# Markdown 인스턴스 생성은 확장 로딩+패턴 컴파일이 대부분 — 스레드별 1회만 만들고 reset() 재사용
+# (Markdown 객체는 convert 중 내부 상태를 가지므로 스레드 간 공유 불가 → threading.local)
+_md_local = threading.local()
+
+
+def _get_markdown() -> md.Markdown:
+    inst = getattr(_md_local, "md", None)
+    if inst is None:
+        inst = md.Markdown(
+            extensions=["fenced_code", "tables", "nl2br"],
+            output_format="html5",
+        )
+        _md_local.md = inst
+    return inst
+
+
+def _set_link_attrs(attrs, new=False):
+    # 기존 <a>에만 rel/target 부여. 본문의 맨 URL을 새 링크로 만들지는 않음(기존 동작 유지)
+    if new:
+        return None
+    attrs[(None, "rel")] = "nofollow noopener"
+    attrs[(None, "target")] = "_blank"
+    return attrs
+
+
+# Cleaner를 1회 구성하면 bleach가 인자 정규화/필터 구성을 호출마다 반복하지 않음
+# rel/target 부여는 sanitize와 같은 토큰 워크에서 처리 (후처리 str.replace 전체 스캔 제거)
+_CLEANER = bleach.sanitizer.Cleaner(
+    tags=_ALLOWED_TAGS,
+    attributes=_ALLOWED_ATTRS,
+    protocols=["http", "https", "mailto"],
+    strip=True,
+    filters=[partial(LinkifyFilter, callbacks=[_set_link_attrs], skip_tags={"pre", "code"})],
+)
+
+
 class Country(models.Model):
     name = models.CharField(max_length=100)          # 예: 대한민국(Korea)
     slug = models.SlugField(unique=True)             # 예: korea / japan
@@ -37,6 +99,8 @@ class Country(models.Model):
         """
         base 로 slug 후보를 만들고, 충돌 시 -2, -3... 붙여서 유니크하게 만든다.
         (필드 추가/마이그레이션 없이 admin/seed 실수 방지용)
+        충돌 slug들을 쿼리 1방으로 미리 모아 suffix 탐색은 메모리에서 수행
+        (후보마다 exists() round-trip 금지 — seed처럼 연속 생성 시 N배 차이).
         """
         base = (base or "").strip()
         s = slugify(base)
@@ -44,19 +108,21 @@ class Country(models.Model):
             s = slugify(base, allow_unicode=True)
         s = (s or "country")[:max_len]
 
+        # suffix가 붙으면 base가 잘릴 수 있으므로, 잘린 뒤에도 공통인 prefix로 조회
+        probe = s[: max(1, max_len - 8)]
+        qs = model_cls.objects.filter(slug__startswith=probe)
+        if instance_pk is not None:
+            qs = qs.exclude(pk=instance_pk)
+        taken = set(qs.values_list("slug", flat=True))
+
         candidate = s
         n = 2
-        while True:
-            qs = model_cls.objects.filter(slug=candidate)
-            if instance_pk is not None:
-                qs = qs.exclude(pk=instance_pk)
-            if not qs.exists():
-                return candidate
-
+        while candidate in taken:
             suffix = f"-{n}"
             cut = max_len - len(suffix)
             candidate = (s[:cut] if cut > 0 else s) + suffix
             n += 1
+        return candidate
 
     def save(self, *args, **kwargs):
         # ✅ ISO 값 정규화
@@ -189,19 +255,25 @@ class Post(models.Model):
 
     class Meta:
         ordering = ["-published_at", "-created_at", "-id"]
+        indexes = [
+            # 상세 URL 해석과 slug-history 충돌 검사(Exists)가 전부 이 조합으로 조회
+            models.Index(fields=["country", "category", "slug"], name="post_cc_slug_idx"),
+        ]
 
     def __str__(self):
         return f"[{self.category}] {self.title}"
 
+    # category → URL slug (changelist 행마다 불리므로 호출마다 dict 재생성 금지)
+    CATEGORY_SLUGS = {
+        Category.TRAVEL: "travel",
+        Category.HISTORY: "history",
+        Category.CULTURE: "culture",
+        Category.MY_LOG: "my-log",
+    }
+
     @property
     def category_slug(self) -> str:
-        mapping = {
-            self.Category.TRAVEL: "travel",
-            self.Category.HISTORY: "history",
-            self.Category.CULTURE: "culture",
-            self.Category.MY_LOG: "my-log",
-        }
-        return mapping.get(self.category, "travel")
+        return self.CATEGORY_SLUGS.get(self.category, "travel")
 
     def get_absolute_url(self):
         return f"/{self.country.slug}/{self.category_slug}/{self.slug}/"
@@ -209,13 +281,15 @@ class Post(models.Model):
     # -------------------------
     # [[img:123]] token replace
     # -------------------------
-    _IMG_TOKEN_RE = re.compile(r"\[\[img:(\d+)\]\]")
-    _FENCED_CODE_RE = re.compile(r"(```.*?```)", re.DOTALL)
+    # 코드블럭과 이미지 토큰을 한 regex로 스캔 — split로 만든 부분 문자열 복사본 없이
+    # 한 패스로 코드블럭은 통과, 토큰만 치환/수집한다
+    _IMG_CODE_RE = re.compile(r"(?P<code>```.*?```)|\[\[img:(?P<id>\d+)\]\]", re.DOTALL)
 
     @staticmethod
     def _unique_slugify(model_cls, base: str, *, instance_pk=None, max_len: int = 220) -> str:
         """
         base 로 slug 후보를 만들고, 충돌 시 -2, -3... 붙여서 유니크하게 만든다.
+        (Country._unique_slugify와 동일: 충돌 집합을 1쿼리로 로드해 메모리에서 탐색)
         """
         base = (base or "").strip()
         s = slugify(base)
@@ -223,19 +297,20 @@ class Post(models.Model):
             s = slugify(base, allow_unicode=True)
         s = (s or "post")[:max_len]
 
+        probe = s[: max(1, max_len - 8)]
+        qs = model_cls.objects.filter(slug__startswith=probe)
+        if instance_pk is not None:
+            qs = qs.exclude(pk=instance_pk)
+        taken = set(qs.values_list("slug", flat=True))
+
         candidate = s
         n = 2
-        while True:
-            qs = model_cls.objects.filter(slug=candidate)
-            if instance_pk is not None:
-                qs = qs.exclude(pk=instance_pk)
-            if not qs.exists():
-                return candidate
-
+        while candidate in taken:
             suffix = f"-{n}"
             cut = max_len - len(suffix)
             candidate = (s[:cut] if cut > 0 else s) + suffix
             n += 1
+        return candidate
 
     def save(self, *args, **kwargs):
         """
@@ -278,11 +353,20 @@ class Post(models.Model):
         if not text:
             return ""
 
-        images_by_id = {str(img.id): img for img in self.images.all()}
+        # prefetch돼 있으면 그 캐시를 그대로 사용 (values_list/only로 새 쿼리를 만들면 N+1 재발).
+        # 아니면 쓰는 컬럼(id/image/caption)만 가져와 ImageField 외 컬럼 전송을 줄인다.
+        if "images" in getattr(self, "_prefetched_objects_cache", {}):
+            imgs = self.images.all()
+        else:
+            imgs = self.images.only("id", "post_id", "image", "caption")
+        images_by_id = {str(img.id): img for img in imgs}
 
         def repl(match: re.Match) -> str:
-            img_id = match.group(1)
-            img = images_by_id.get(img_id)
+            code = match.group("code")
+            if code is not None:
+                return code
+
+            img = images_by_id.get(match.group("id"))
             if not img:
                 return match.group(0)
 
@@ -301,14 +385,7 @@ class Post(models.Model):
                 "</figure>"
             )
 
-        parts = self._FENCED_CODE_RE.split(text)
-        out = []
-        for part in parts:
-            if part.startswith("```") and part.endswith("```"):
-                out.append(part)
-            else:
-                out.append(self._IMG_TOKEN_RE.sub(repl, part))
-        return "".join(out)
+        return self._IMG_CODE_RE.sub(repl, text)
 
     def used_image_ids(self) -> set[int]:
         text = self.content or ""
@@ -316,56 +393,32 @@ class Post(models.Model):
             return set()
 
         ids: set[int] = set()
-        parts = self._FENCED_CODE_RE.split(text)
-        for part in parts:
-            if part.startswith("```") and part.endswith("```"):
+        for m in self._IMG_CODE_RE.finditer(text):
+            if m.group("code") is not None:
                 continue
-            for m in self._IMG_TOKEN_RE.finditer(part):
-                try:
-                    ids.add(int(m.group(1)))
-                except Exception:
-                    pass
+            try:
+                ids.add(int(m.group("id")))
+            except Exception:
+                pass
         return ids
 
     def rendered_content(self) -> str:
-        src_md = self._replace_img_tokens_outside_codeblocks(self.content or "")
+        # markdown+bleach는 (content, images)의 순수 함수 — updated_at 버전 키로 캐시해
+        # 목록/상세 재방문 시 파싱을 통째로 건너뛴다 (save마다 updated_at이 바뀌므로 자동 무효화)
+        key = None
+        if self.pk and self.updated_at:
+            # 초 단위로 자르면 같은 초 안의 재저장이 stale 캐시를 돌려줌 — full timestamp 사용
+            key = f"post:rendered:{self.pk}:{self.updated_at.timestamp()}"
+            cached = cache.get(key)
+            if cached is not None:
+                return cached
 
-        raw_html = md.markdown(
-            src_md,
-            extensions=["fenced_code", "tables", "nl2br"],
-            output_format="html5",
-        )
-
-        allowed_tags = bleach.sanitizer.ALLOWED_TAGS.union({
-            "p", "br", "hr",
-            "h1", "h2", "h3", "h4",
-            "ul", "ol", "li",
-            "blockquote",
-            "pre", "code",
-            "table", "thead", "tbody", "tr", "th", "td",
-            "img",
-            "figure", "figcaption",
-        })
-
-        allowed_attrs = {
-            **bleach.sanitizer.ALLOWED_ATTRIBUTES,
-            "a": ["href", "title", "target", "rel"],
-            "img": ["src", "alt", "title", "class", "loading", "decoding", "width", "height", "data-full", "data-caption"],
-            "figure": ["class"],
-            "figcaption": ["class"],
-            "th": ["align"],
-            "td": ["align"],
-        }
-
-        cleaned = bleach.clean(
-            raw_html,
-            tags=allowed_tags,
-            attributes=allowed_attrs,
-            protocols=["http", "https", "mailto"],
-            strip=True,
-        )
+        src_md = self._replace_img_tokens_outside_codeblocks(self.content or "")
+        raw_html = _get_markdown().reset().convert(src_md)
+        cleaned = _CLEANER.clean(raw_html)
 
-        cleaned = cleaned.replace("<a ", '<a rel="nofollow noopener" target="_blank" ')
+        if key is not None:
+            cache.set(key, cleaned, 86400)
         return cleaned
 
 
@@ -397,6 +450,24 @@ class PostImage(models.Model):
             self.order = (max_order or 0) + 10
         super().save(*args, **kwargs)
 
+    @classmethod
+    def bulk_append(cls, post, images, *, batch_size=500):
+        """
+        여러 이미지를 post 뒤에 한 번에 붙인다.
+        save()를 N번 돌리면 MAX(order) SELECT N번 + INSERT N번 — 여기선 각각 1번.
+        (order 간격 10은 save()의 자동 배정과 동일)
+        """
+        images = list(images)
+        if not images:
+            return images
+        base = (
+            cls.objects.filter(post=post).aggregate(m=Max("order")).get("m")
+        ) or 0
+        for i, im in enumerate(images, start=1):
+            im.post = post
+            im.order = base + 10 * i
+        return cls.objects.bulk_create(images, batch_size=batch_size)
+
 
 class SeedMeta(models.Model):
     """Seed(초기 데이터) 적용 이력을 1-row로 기록해 재시딩을 안전하게 만든다."""
@@ -47,6 +47,24 @@ class FixSlugHistoryCommandTests(TestCase):
         self.assertEqual(PostSlugHistory.objects.count(), 0)
 
 
+class FixTagSlugsCommandTests(TestCase):
+    def test_fix_tag_slugs_renames_and_records_history(self):
+        t = Tag.objects.create(name="Hot Spring", slug="wrong")
+
+        with self.assertRaises(SystemExit):
+            call_command("fix_tag_slugs")
+
+        call_command("fix_tag_slugs", "--apply")
+        t.refresh_from_db()
+        self.assertEqual(t.slug, "hot-spring")
+        self.assertTrue(TagSlugHistory.objects.filter(old_slug="wrong", tag=t).exists())
+
+    def test_fix_tag_slugs_noop_when_aligned(self):
+        Tag.objects.create(name="Hot Spring", slug="hot-spring")
+        call_command("fix_tag_slugs")  # SystemExit 없이 통과해야 함
+        self.assertEqual(TagSlugHistory.objects.count(), 0)
+
+
 class TagSlugHistoryRedirectTests(TestCase):
     def test_unicode_tag_slug_resolves_200(self):
         tag = Tag.objects.create(name="온천")  # slug 자동: '온천'